@@ -3,17 +3,21 @@ from __future__ import annotations
 
 import time
 import warnings
-from functools import partial
+from functools import cached_property, lru_cache, partial
 from typing import Any
 
 import numpy as np
 import pandas as pd
 import pytest
-from scipy.stats import chi2, f
+from numba import njit, prange
+from scipy.linalg import eigh, pinv, svd
+from scipy.linalg.blas import get_blas_funcs
+from scipy.optimize import brentq
+from scipy.special import chdtri, fdtrc, fdtri
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.cross_decomposition import PLSRegression as PLS_sklearn
 from sklearn.decomposition import PCA as PCA_sklearn
-from sklearn.utils.validation import check_is_fitted
+from sklearn.utils.validation import check_array, check_is_fitted
 
 from .plots import loadings_plot, score_plot, spe_plot, t2_plot
 
@@ -35,10 +39,32 @@ class MCUVScaler(BaseEstimator, TransformerMixin):
 
     def fit(self, X, y=None):
         """Get the centering and scaling object constants."""
-        self.center_ = pd.DataFrame(X).mean()
-        # this is the key difference with "preprocessing.StandardScaler"
-        self.scale_ = pd.DataFrame(X).std(ddof=1)
-        self.scale_[self.scale_ == 0] = 1.0  # columns with no variance are left as-is.
+        X = pd.DataFrame(X)
+        values = X.to_numpy(dtype=float)
+
+        # Single pass over the data: the sum and sum of squares per column, skipping missing values.
+        present = ~np.isnan(values)
+        n_present = present.sum(axis=0)
+        if not present.all():
+            values = np.where(present, values, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            center = values.sum(axis=0) / n_present
+            sum_squares = np.einsum("ij,ij->j", values, values)
+            # this is the key difference with "preprocessing.StandardScaler": ddof=1
+            variance = (sum_squares - n_present * center**2) / (n_present - 1)
+
+            # The sum-of-squares shortcut loses precision when the variance is tiny relative to the
+            # mean: use the two-pass calculation for those columns.
+            unstable = variance <= 1e-4 * center**2
+            if np.any(unstable):
+                deviations = np.where(present[:, unstable], values[:, unstable] - center[unstable], 0.0)
+                variance[unstable] = np.einsum("ij,ij->j", deviations, deviations) / (n_present[unstable] - 1)
+
+        scale = np.sqrt(variance)
+        np.putmask(scale, scale == 0, 1.0)  # columns with no variance are left as-is.
+        self.center_ = pd.Series(center, index=X.columns)
+        self.scale_ = pd.Series(scale, index=X.columns)
         return self
 
     def transform(self, X) -> pd.DataFrame:
@@ -46,16 +72,39 @@ class MCUVScaler(BaseEstimator, TransformerMixin):
         check_is_fitted(self, "center_")
         check_is_fitted(self, "scale_")
 
-        X = pd.DataFrame(X).copy()
-        return (X - self.center_) / self.scale_
+        # The NumPy arithmetic creates a new array, so there is no need to copy `X` first.
+        X = self._match_columns(X)
+        values = (X.to_numpy(dtype=float) - self.center_.to_numpy()) / self.scale_.to_numpy()
+        return pd.DataFrame(values, index=X.index, columns=X.columns)
 
     def inverse_transform(self, X) -> pd.DataFrame:
         """Do the inverse transformation."""
         check_is_fitted(self, "center_")
         check_is_fitted(self, "scale_")
 
-        X = pd.DataFrame(X).copy()
-        return X * self.scale_ + self.center_
+        X = self._match_columns(X)
+        values = X.to_numpy(dtype=float) * self.scale_.to_numpy() + self.center_.to_numpy()
+        return pd.DataFrame(values, index=X.index, columns=X.columns)
+
+    def _match_columns(self, X) -> pd.DataFrame:
+        """
+        Return `X` as a DataFrame, with its columns in the same order as the data used to fit the scaler.
+
+        A DataFrame's columns are matched by their labels (and reordered, if needed). Only data without
+        column labels, such as a NumPy array, is matched by position.
+        """
+        if not isinstance(X, pd.DataFrame):
+            return pd.DataFrame(X, columns=self.center_.index)
+
+        if X.columns.equals(self.center_.index):
+            return X
+        if X.columns.has_duplicates or set(X.columns) != set(self.center_.index):
+            emsg = (
+                "The column names must be the same as those used to fit the scaler: "
+                f"{list(self.center_.index)}; got {list(X.columns)}."
+            )
+            raise ValueError(emsg)
+        return X[self.center_.index]
 
 
 class PCA(PCA_sklearn):
@@ -71,6 +120,8 @@ class PCA(PCA_sklearn):
         random_state=None,
         # Own extra inputs, for the case when there is missing data
         missing_data_settings: dict | None = None,
+        # Precision used to fit the model, e.g. np.float32; by default the precision of the data.
+        dtype: type | None = None,
     ):
         super().__init__(
             n_components=n_components,
@@ -83,6 +134,7 @@ class PCA(PCA_sklearn):
         )
         self.n_components: int = n_components
         self.missing_data_settings = missing_data_settings
+        self.dtype = dtype
         self.has_missing_data = False
 
     def fit(self, X, y=None) -> PCA_sklearn:  # noqa: PLR0915
@@ -104,6 +156,11 @@ class PCA(PCA_sklearn):
         if not isinstance(X, pd.DataFrame):
             X = pd.DataFrame(X)
 
+        if self.dtype is not None:
+            # Single precision halves the memory traffic of the decomposition on large data sets, and
+            # is more than adequate to set T2 and SPE limits.
+            X = X.astype(self.dtype)
+
         self.N, self.K = X.shape
 
         # Check if number of components is supported against maximum requested
@@ -141,7 +198,16 @@ class PCA(PCA_sklearn):
             self.fit(X)
 
         else:
-            self = super().fit(X)
+            x_scores = None
+            if self.N < self.K and self.A < self.N and self.svd_solver == "auto" and not self.whiten:
+                x_scores = self._fit_gram(X)
+
+            if x_scores is None:
+                # A single call does the SVD once, and returns the scores from that same decomposition.
+                x_scores = super().fit_transform(X)
+            # The residual calculations multiply by the loadings: BLAS is fastest on contiguous memory.
+            # This is a no-op (no copy) if the components are already C-contiguous.
+            self.components_ = np.ascontiguousarray(self.components_)
             self.x_loadings = self.components_.T
             self.extra_info = {}
             self.extra_info["timing"] = np.zeros((1, self.A)) * np.nan
@@ -152,6 +218,9 @@ class PCA(PCA_sklearn):
         self.N = self.n_samples_
         self.K = self.n_features_in_
 
+        # The statistics and limits derived from the model are always in double precision.
+        self.explained_variance_ = np.asarray(self.explained_variance_, dtype=np.float64)
+
         self.loadings = pd.DataFrame(self.x_loadings.copy())
         self.loadings.index = X.columns
 
@@ -163,12 +232,8 @@ class PCA(PCA_sklearn):
             index=component_names,
             name="Standard deviation per score",
         )
-        self.Hotellings_T2 = pd.DataFrame(
-            np.zeros(shape=(self.N, self.A)),
-            columns=component_names,
-            index=X.index,
-            # name="Hotelling's T^2 statistic, per component",
-        )
+        # Only ever used as a divisor, so store the reciprocal once, and multiply by it.
+        self._inv_scaling = np.reciprocal(self.scaling_factor_for_scores.values)
         if self.has_missing_data:
             self.x_scores = pd.DataFrame(self.x_scores_, columns=component_names, index=X.index)
             self.squared_prediction_error = pd.DataFrame(
@@ -193,7 +258,7 @@ class PCA(PCA_sklearn):
                 # name ="Per variable R^2, per component"
             )
         else:
-            self.x_scores = pd.DataFrame(super().fit_transform(X), columns=component_names, index=X.index)
+            self.x_scores = pd.DataFrame(x_scores, columns=component_names, index=X.index)
             self.squared_prediction_error = pd.DataFrame(
                 np.zeros((self.N, self.A)),
                 columns=component_names,
@@ -217,36 +282,32 @@ class PCA(PCA_sklearn):
             )
 
         if not self.has_missing_data:
-            xd = X.copy()
-            prior_ssx_col = ssq(xd.values, axis=0)
+            # Residual Sums of Squares (RSS), i.e. of X-X_hat, after each component. These are calculated
+            # directly from the residuals, not from the shortcut ||x||^2 - ||t||^2: that difference
+            # cancels out almost all the digits when the model fits the data closely, which is exactly
+            # when small SPE values matter. X is deflated in blocks of rows, rather than as a full copy.
+            xv = X.to_numpy(dtype=np.float64)
+            row_ssx, col_ssx = residual_ssq_per_component(
+                xv, self.x_scores.to_numpy(dtype=np.float64), np.asarray(self.x_loadings, dtype=np.float64)
+            )
+            prior_ssx_col = np.einsum("ij,ij->j", xv, xv)
             base_variance = np.sum(prior_ssx_col)
-            for a in range(self.A):
-                xd -= self.x_scores.iloc[:, [a]] @ self.loadings.iloc[:, [a]].T
-                # These are the Residual Sums of Squares (RSS); i.e X-X_hat
-                row_ssx = ssq(xd.values, axis=1)
-                col_ssx = ssq(xd.values, axis=0)
-
-                # Don't use a check correction factor. Define SPE simply as the sum of squares of
-                # the errors, then take the square root, so it is interpreted like a standard error.
-                # If the user wants to normalize it, then this is a clean base value to start from.
-                self.squared_prediction_error.iloc[:, a] = np.sqrt(row_ssx)
-
-                # TODO: some entries in prior_SSX_col can be zero and leads to nan's in R2X_cum
-                self.R2X_cum.iloc[:, a] = 1 - col_ssx / prior_ssx_col
-
-                # R2 and cumulative R2 value for the whole block
-                self.R2cum.iloc[a] = 1 - sum(row_ssx) / base_variance
-                if a > 0:
-                    self.R2.iloc[a] = self.R2cum.iloc[a] - self.R2cum.iloc[a - 1]
-                else:
-                    self.R2.iloc[a] = self.R2cum.iloc[a]
+
+            # Don't use a check correction factor. Define SPE simply as the sum of squares of
+            # the errors, then take the square root, so it is interpreted like a standard error.
+            # If the user wants to normalize it, then this is a clean base value to start from.
+            self.squared_prediction_error.iloc[:, :] = np.sqrt(row_ssx)
+
+            # TODO: some entries in prior_SSX_col can be zero and leads to nan's in R2X_cum
+            self.R2X_cum.iloc[:, :] = 1 - col_ssx / prior_ssx_col[:, np.newaxis]
+
+            # R2 and cumulative R2 value for the whole block
+            self.R2cum.iloc[:] = 1 - col_ssx.sum(axis=0) / base_variance
+            self.R2.iloc[:] = np.diff(self.R2cum.values, prepend=0.0)
         # end: has no missing data
 
-        for a in range(self.A):
-            self.Hotellings_T2.iloc[:, a] = (
-                self.Hotellings_T2.iloc[:, max(0, a - 1)]
-                + (self.x_scores.iloc[:, a] / self.scaling_factor_for_scores.iloc[a]) ** 2
-            )
+        # Hotelling's T2 is only calculated when first used. Discard the value from a prior fit, if any.
+        self.__dict__.pop("Hotellings_T2", None)
 
         # Replace `self.loadings` with self.x_loadings
         self.x_loadings = self.loadings
@@ -265,6 +326,74 @@ class PCA(PCA_sklearn):
 
         return self
 
+    @cached_property
+    def Hotellings_T2(self) -> pd.DataFrame:  # noqa: N802
+        """Hotelling's T2 statistic, accumulated over the components: sum_a (t_a / s_a)^2.
+
+        This is calculated from the scores the first time it is used, and then cached.
+        """
+        return pd.DataFrame(
+            np.cumsum(np.square(self.x_scores.values * self._inv_scaling), axis=1),
+            columns=self.x_scores.columns,
+            index=self.x_scores.index,
+        )
+
+    def _fit_gram(self, X: pd.DataFrame) -> np.ndarray | None:
+        """
+        Fit the model from the eigen-decomposition of the N x N Gram matrix of the centered data.
+
+        This is much cheaper than an SVD of X when there are far fewer rows than columns (N << K).
+        The fitted attributes are the same as those from the scikit-learn fit.
+
+        Returns the N x A matrix of scores, or None if the requested components cannot be reliably
+        calculated this way (too little variance left in the last component), in which case the
+        regular SVD must be used instead.
+        """
+        xv = check_array(X, dtype=[np.float64, np.float32])
+        N, K, A = xv.shape[0], xv.shape[1], self.A
+
+        # Gram matrix of the centered data, Xc Xc'. The data are centered explicitly: correcting the
+        # Gram matrix of uncentered data afterwards cancels catastrophically when the column means are
+        # large. It is symmetric, so the BLAS rank-k update (SYRK) only forms the upper triangle: half
+        # the work of `xc @ xc.T`. Passing `xc.T` with `trans=1` avoids a copy to Fortran order.
+        mean = xv.mean(axis=0)
+        xc = xv - mean
+        syrk = get_blas_funcs("syrk", (xc,))
+        gram = syrk(1.0, xc.T, trans=1)
+
+        # Only the largest A eigenvalues are needed; `eigh` returns them in ascending order, and only
+        # reads the upper triangle of `gram`.
+        eigenvalues, eigenvectors = eigh(gram, lower=False, subset_by_index=[N - A, N - 1])
+        eigenvalues, eigenvectors = eigenvalues[::-1], eigenvectors[:, ::-1]
+        # The Gram matrix squares the condition number of X, so the smallest eigenvalue is only accurate
+        # if it is well above the round-off of the largest one, in the precision of the data.
+        if eigenvalues[-1] <= np.sqrt(np.finfo(xv.dtype).eps) * eigenvalues[0]:
+            return None
+
+        # Project back: Xc = U S V', so that V = Xc' U / S, and the scores are T = U S.
+        singular_values = np.sqrt(eigenvalues)
+        components = (xc.T @ eigenvectors) / singular_values
+        scores = eigenvectors * singular_values
+
+        # Same sign convention as scikit-learn: the largest loading (in magnitude) is positive.
+        signs = np.sign(components[np.argmax(np.abs(components), axis=0), np.arange(A)])
+        components *= signs
+        scores *= signs
+
+        total_variance = np.trace(gram) / (N - 1)
+        self.mean_ = mean
+        self.components_ = np.ascontiguousarray(components.T)
+        self.n_components_ = A
+        self.n_samples_ = N
+        self.n_features_in_ = K
+        if all(isinstance(column, str) for column in X.columns):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.explained_variance_ = eigenvalues / (N - 1)
+        self.explained_variance_ratio_ = self.explained_variance_ / total_variance
+        self.singular_values_ = singular_values
+        self.noise_variance_ = (total_variance - np.sum(self.explained_variance_)) / (min(N, K) - A)
+        return scores
+
     def fit_transform(self, X, y=None):
         self.fit(X)
         pytest.fail("Still do the transform part")
@@ -279,22 +408,18 @@ class PCA(PCA_sklearn):
         state.N, state.K = X.shape
         assert self.K == state.K, "Prediction data must have same number of columns as training data."
 
-        state.x_scores = X @ self.x_loadings
-
         # TODO: handle the missing data version here still
-        for _ in range(self.A):
-            pass
-            # p = self.x_loadings.iloc[:, [a]]
-            # temp = X @ self.x_loadings.iloc[:, [a]]
-            # X_mcuv -= temp @ p.T
-            # state.x_scores[:, [a]] = temp
-
-        # Scores are calculated, now do the rest
-        state.Hotellings_T2 = np.sum(np.power((state.x_scores / self.scaling_factor_for_scores.values), 2), 1)
-        # Calculate SPE-residuals (sum over rows of the errors)
-        X_mcuv = X.copy()
-        X_mcuv -= state.x_scores @ self.x_loadings.T
-        state.squared_prediction_error = np.sqrt(np.power(X_mcuv, 2).sum(axis=1))
+        # The scores, Hotelling's T2 and the SPE-residuals (sum over rows of the errors) are all
+        # calculated in a single pass over each row of X.
+        x_scores, hotellings_t2, residual_ssq = _score_batch(
+            np.ascontiguousarray(X, dtype=np.float64),
+            np.ascontiguousarray(self.x_loadings.to_numpy(dtype=np.float64).T),
+            np.square(self._inv_scaling),
+        )
+        index = getattr(X, "index", None)
+        state.x_scores = pd.DataFrame(x_scores, index=index, columns=self.x_loadings.columns)
+        state.Hotellings_T2 = pd.Series(hotellings_t2, index=index)
+        state.squared_prediction_error = pd.Series(np.sqrt(residual_ssq), index=index)
         return state
 
 
@@ -314,6 +439,9 @@ class PCA_missing_values(BaseEstimator, TransformerMixin):
 
     valid_md_methods = ["pmp", "scp", "nipals", "tsr"]
 
+    # `PCA.fit` returns an instance of this class when there is missing data.
+    Hotellings_T2 = PCA.Hotellings_T2
+
     def __init__(
         self,
         n_components=None,
@@ -446,7 +574,7 @@ class PCA_missing_values(BaseEstimator, TransformerMixin):
             self.extra_info["iterations"][a] = itern
 
             # Loop terminated!  Now deflate the X-matrix
-            Xd -= np.dot(t_a, p_a.T)
+            _rank_one_update(Xd, t_a.ravel(), p_a.ravel())
             # These are the Residual Sums of Squares (RSS); i.e X-X_hat
             row_SSX = ssq(Xd, axis=1)
             col_SSX = ssq(Xd, axis=0)
@@ -502,10 +630,11 @@ class PCA_missing_values(BaseEstimator, TransformerMixin):
             mean_X = np.mean(Xd, axis=0)
             S = np.cov(Xd, rowvar=False, ddof=1)
             Xc = Xd - mean_X
+            # Xc is used again below, so it may not be overwritten; it has no missing values to check.
             if N > K:
-                _, _, V = np.linalg.svd(Xc, full_matrices=False)
+                _, _, V = svd(Xc, full_matrices=False, check_finite=False, lapack_driver="gesdd")
             else:
-                V, _, _ = np.linalg.svd(Xc.T, full_matrices=False)
+                V, _, _ = svd(Xc.T, full_matrices=False, check_finite=False, lapack_driver="gesdd")
 
             V = V.T[:, 0:A]  # transpose first
             for n in range(N):
@@ -524,7 +653,7 @@ class PCA_missing_values(BaseEstimator, TransformerMixin):
 
         # All done: return the results in `self`
         S = np.cov(Xd, rowvar=False, ddof=1)
-        _, _, V = np.linalg.svd(S, full_matrices=False)
+        _, _, V = svd(S, full_matrices=False, overwrite_a=True, check_finite=False, lapack_driver="gesdd")
         self.extra_info["iterations"] = itern
         self.extra_info["timing"] = time.time() - start_time
         self.x_loadings = (V[0:A, :]).T  # transpose result to the right shape: K x A
@@ -570,6 +699,10 @@ class PLS(PLS_sklearn):
         """
         Fit a projection to latent structures (PLS) or Partial Least Square (PLS) model to the data.
 
+        With no missing data the model is fitted directly, without iterating, so `max_iter` and `tol`
+        are not used. With missing data, the `missing_data_settings` control the iterations instead;
+        `max_iter` is the default for its `md_max_iter`.
+
         Parameters
         ----------
         X : array-like, shape (n_samples, n_features)
@@ -631,7 +764,7 @@ class PLS(PLS_sklearn):
             # Call the sub-function to do the PLS fit when missing data are present
             self.fit(X, Y)
         else:
-            self = super().fit(X, Y)
+            self._fit_kernel_pls(X, Y)
             # x_scores #T: N x A
             # y_scores # U: N x A
             # x_weights # W: K x A
@@ -641,7 +774,7 @@ class PLS(PLS_sklearn):
 
             self.extra_info = {}
             self.extra_info["timing"] = np.zeros(self.A) * np.nan
-            self.extra_info["iterations"] = np.array(self.n_iter_)
+            self.extra_info["iterations"] = np.zeros(self.A) * np.nan
 
         # We have now fitted the model. Apply some convenience shortcuts for the user.
         self.A = self.n_components
@@ -670,6 +803,8 @@ class PLS(PLS_sklearn):
             index=component_names,
             name="Standard deviation per score",
         )
+        # Only ever used as a divisor, so store the reciprocal once, and multiply by it.
+        self._inv_scaling = np.reciprocal(self.scaling_factor_for_scores.values)
         self.Hotellings_T2 = pd.DataFrame(
             np.zeros(shape=(self.N, self.A)),
             columns=component_names,
@@ -715,11 +850,13 @@ class PLS(PLS_sklearn):
         prior_SSX_col = ssq(Xd.values, axis=0)
         prior_SSY_col = ssq(Yd.values, axis=0)
         base_variance_Y = np.sum(prior_SSY_col)
+
+        # Hotelling's T2, accumulated over the components. Multiply by the reciprocal of the scaling
+        # factor, then square in-place, so there is only a single N x A temporary.
+        scaled_scores = np.multiply(self.x_scores.values, self._inv_scaling)
+        np.square(scaled_scores, out=scaled_scores)
+        self.Hotellings_T2.iloc[:, :] = np.cumsum(scaled_scores, axis=1)
         for a in range(self.A):
-            self.Hotellings_T2.iloc[:, a] = (
-                self.Hotellings_T2.iloc[:, max(0, a - 1)]
-                + (self.x_scores.iloc[:, a] / self.scaling_factor_for_scores.iloc[a]) ** 2
-            )
             Xd -= self.x_scores.iloc[:, [a]] @ self.x_loadings.iloc[:, [a]].T
             y_hat = self.x_scores.iloc[:, 0 : (a + 1)] @ self.y_loadings.iloc[:, 0 : (a + 1)].T
             # These are the Residual Sums of Squares (RSS); i.e X-X_hat
@@ -759,6 +896,100 @@ class PLS(PLS_sklearn):
 
         return self
 
+    def _fit_kernel_pls(self, X: pd.DataFrame, Y: pd.DataFrame) -> None:  # noqa: PLR0915
+        """
+        Fit the model when there are no missing data, with each X-weight vector from an SVD of X'Y.
+
+        This is the same model as from the NIPALS algorithm in scikit-learn's `PLSRegression`: at
+        convergence, the NIPALS weights are the first left singular vector of the (deflated) X'Y
+        matrix. Here that vector comes from a single SVD of the small K x M matrix, rather than from
+        iterating to convergence. Only the K x K and K x M cross-product matrices are deflated, so the
+        N rows of X and Y are read just a few times in total. The fitted attributes are the same as
+        those from scikit-learn, in the layout of version 1.3 and later (`coef_` is M x K). There is
+        nothing to iterate, so `max_iter` and `tol` are not used.
+        """
+        Xk = check_array(X, dtype=np.float64, copy=True, ensure_min_samples=2)
+        Yk = check_array(Y, dtype=np.float64, copy=True)
+        N, K, M, A = self.N, self.K, self.M, self.A
+        self.n_features_in_ = K
+        if all(isinstance(column, str) for column in X.columns):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+
+        # Center, and scale to unit variance (if requested), as scikit-learn does.
+        self._x_mean, self._y_mean = Xk.mean(axis=0), Yk.mean(axis=0)
+        Xk -= self._x_mean
+        Yk -= self._y_mean
+        if self.scale:
+            self._x_std, self._y_std = Xk.std(axis=0, ddof=1), Yk.std(axis=0, ddof=1)
+            self._x_std[self._x_std == 0.0] = 1.0
+            self._y_std[self._y_std == 0.0] = 1.0
+            Xk /= self._x_std
+            Yk /= self._y_std
+        else:
+            self._x_std, self._y_std = np.ones(K), np.ones(M)
+
+        self.x_weights_ = np.zeros((K, A))
+        self.y_weights_ = np.zeros((M, A))
+        self.x_loadings_ = np.zeros((K, A))
+        self.y_loadings_ = np.zeros((M, A))
+        self.x_rotations_ = np.zeros((K, A))
+        self.n_iter_ = []
+
+        # Kernel PLS (Dayal and MacGregor, 1997): X and Y are only used to form X'X and X'Y, once.
+        # Deflating X'Y is equivalent to deflating both X and Y, and the scores come from the
+        # rotations at the end.
+        XtX = Xk.T @ Xk
+        XtY = Xk.T @ Yk
+        y_ssq = np.einsum("ij,ij->j", Yk, Yk)  # residual sum of squares of each column in Y
+        y_tol = N * (10 * np.finfo(Yk.dtype).eps) ** 2
+        n_fitted = A
+        for a in range(A):
+            # Columns of Y which are all close to zero are set to zero; stop if nothing is left in Y.
+            y_is_zero = y_ssq < y_tol
+            if np.all(y_is_zero):
+                warnings.warn(f"y residual is constant at iteration {a}", stacklevel=2)
+                n_fitted = a
+                break
+            XtY[:, y_is_zero] = 0.0
+
+            u, _, _ = svd(XtY, full_matrices=False, check_finite=False, lapack_driver="gesdd")
+            w_a = u[:, 0]
+            # Same sign convention as scikit-learn: the largest weight (in magnitude) is positive.
+            w_a *= np.sign(w_a[np.argmax(np.abs(w_a))])
+
+            # The rotation, r_a, gives the X-scores directly from the undeflated X: t_a = X r_a.
+            r_a = w_a - self.x_rotations_[:, :a] @ (self.x_loadings_[:, :a].T @ w_a)
+            XtX_r = XtX @ r_a
+            tt = r_a @ XtX_r
+            p_a = XtX_r / tt
+            c_a = (w_a @ XtY) / tt
+
+            # Deflate X'Y with the X-scores.
+            _rank_one_update(XtY, p_a, c_a, alpha=-tt)
+            y_ssq -= tt * c_a**2
+
+            self.x_weights_[:, a] = w_a
+            self.y_weights_[:, a] = c_a
+            self.x_loadings_[:, a] = p_a
+            self.y_loadings_[:, a] = c_a
+            self.x_rotations_[:, a] = r_a
+
+        # The Y-scores are from the deflated Y: u_a = (Y - T[:, :a] C[:, :a]') c_a / (c_a'c_a)
+        self._x_scores = Xk @ self.x_rotations_
+        self._y_scores = np.zeros((N, A))
+        C, T = self.y_loadings_[:, :n_fitted], self._x_scores[:, :n_fitted]
+        CtC = C.T @ C
+        self._y_scores[:, :n_fitted] = (Yk @ C - T @ np.triu(CtC, k=1)) / np.diag(CtC)
+
+        self.y_rotations_ = self.y_weights_ @ pinv(self.y_loadings_.T @ self.y_weights_, check_finite=False)
+        self.coef_ = ((self.x_rotations_ @ self.y_loadings_.T) * self._y_std).T / self._x_std
+        self.intercept_ = self._y_mean
+        self._n_features_out = A
+        self._predict_1d = False
+        self._norm_y_weights = False
+        self.x_scores_ = self._x_scores
+        self.y_scores_ = self._y_scores
+
     def predict(self, X):
         """Use the PLS model on new data coming in matrix X."""
 
@@ -781,11 +1012,12 @@ class PLS(PLS_sklearn):
             # state.x_scores[:, [a]] = temp
 
         # Scores are calculated, now do the rest
-        state.Hotellings_T2 = np.sum(np.power((state.x_scores / self.scaling_factor_for_scores.values), 2), 1)
+        state.Hotellings_T2 = np.square(state.x_scores * self._inv_scaling).sum(axis=1)
         # Calculate SPE-residuals (sum over rows of the errors)
-        X_mcuv = X.copy()
-        X_mcuv -= state.x_scores @ self.x_loadings.T
-        state.squared_prediction_error = np.sqrt(np.power(X_mcuv, 2).sum(axis=1))
+        residual_ssq = residual_ssq_per_row(
+            np.asarray(X), np.ascontiguousarray(state.x_scores), np.asarray(self.x_loadings)
+        )
+        state.squared_prediction_error = pd.Series(np.sqrt(residual_ssq), index=getattr(X, "index", None))
         # Predicted values from the model (user still has to un-preprocess these predictions!)
         state.y_hat = state.x_scores @ self.y_loadings.T
 
@@ -845,9 +1077,9 @@ class PLS_missing_values(BaseEstimator, TransformerMixin):
         1.  Höskuldsson, PLS regression methods, Journal of Chemometrics, 2(3), 211-228, 1998,
             http://dx.doi.org/10.1002/cem.1180020306
         """
-        # Force input to NumPy array:
-        self.Xd = np.asarray(X)
-        self.Yd = np.asarray(Y)
+        # Copy the inputs into NumPy arrays, since these are deflated in place:
+        self.Xd = np.array(X, dtype=float)
+        self.Yd = np.array(Y, dtype=float)
 
         if np.any(np.sum(self.Yd, axis=1) == 0):
             raise Warning(
@@ -922,43 +1154,11 @@ class PLS_missing_values(BaseEstimator, TransformerMixin):
                 )
                 raise RuntimeError(emsg)
 
-            # Initialize t_a with random numbers, or carefully select a column from X or Y?
-            # Find a column with the largest variance as t1_start; replace missing with zeros
-            # All columns have the same variance if the data have been scaled to unit variance!
-            u_a_guess = self.Yd[:, [0]]
-            u_a_guess[np.isnan(u_a_guess)] = 0
-            u_a = u_a_guess + 1.0
-
-            while not (terminate_check(u_a_guess, u_a, iterations=itern, settings=settings)):
-                # 0: starting point for convergence checking on next loop
-                u_a_guess = u_a.copy()
-
-                # 1: Regress the score, u_a, onto every column in X, compute the
-                #    regression coefficient and store in w_a
-                # w_a = X.T * u_a / (u_a.T * u_a)
-                w_a = quick_regress(self.Xd, u_a)
-
-                # 2: Normalize w_a to unit length
-                w_a /= np.sqrt(ssq(w_a))
-
-                # 3: Now regress each row in X on the w_a vector, and store the
-                #    regression coefficient in t_a
-                # t_a = X * w_a / (w_a.T * w_a)
-                t_a = quick_regress(self.Xd, w_a)
-
-                # 4: Now regress score, t_a, onto every column in Y, compute the
-                #    regression coefficient and store in c_a
-                # c_a = Y * t_a / (t_a.T * t_a)
-                c_a = quick_regress(self.Yd, t_a)
-
-                # 5: Now regress each row in Y on the c_a vector, and store the
-                #    regression coefficient in u_a
-                # u_a = Y * c_a / (c_a.T * c_a)
-                #
-                # TODO(KGD):  % Still handle case when entire row in Y is missing
-                u_a = quick_regress(self.Yd, c_a)
-
-                itern += 1
+            # The iterations, steps 1 to 5, are compiled: see `_nipals_pls_iterate`.
+            t_a, u_a, w_a, c_a, itern = _nipals_pls_iterate(
+                self.Xd, self.Yd, tol=settings["md_tol"], max_iter=settings["md_max_iter"]
+            )
+            t_a, u_a, w_a, c_a = t_a[:, np.newaxis], u_a[:, np.newaxis], w_a[:, np.newaxis], c_a[:, np.newaxis]
 
             self.extra_info["timing"][a] = time.time() - start_time
             self.extra_info["iterations"][a] = itern
@@ -971,8 +1171,8 @@ class PLS_missing_values(BaseEstimator, TransformerMixin):
             # X-space.  Regress columns of t_a onto each column in X and calculate loadings, p_a.
             # Use this p_a to deflate afterwards.
             p_a = quick_regress(self.Xd, t_a)  # Note the similarity with step 4!
-            self.Xd -= np.dot(t_a, p_a.T)  # and that similarity helps understand
-            self.Yd -= np.dot(t_a, c_a.T)  # the deflation process.
+            _rank_one_update(self.Xd, t_a.ravel(), p_a.ravel())  # and that similarity helps understand
+            _rank_one_update(self.Yd, t_a.ravel(), c_a.ravel())  # the deflation process.
 
             ## VIP value (only calculated for X-blocks); only last column is useful
             # self.stats.VIP_a = np.zeros((self.K, self.A))
@@ -1026,6 +1226,144 @@ def ssq(X: np.ndarray, axis: int | None = None) -> Any:
     return out
 
 
+def residual_ssq_per_row(X: np.ndarray, scores: np.ndarray, loadings: np.ndarray, block_size: int = 1024) -> np.ndarray:
+    """Calculate the sum of squares, per row, of the residuals `X - scores @ loadings.T`.
+
+    The rows are processed in blocks of `block_size`, so the reconstructed N x K matrix is never
+    created in full: each block of the residuals is small enough to stay in the CPU cache.
+    """
+    N = X.shape[0]
+    out = np.empty(N)
+    for start in range(0, N, block_size):
+        rows = slice(start, start + block_size)
+        residuals = scores[rows] @ loadings.T
+        residuals -= X[rows]
+        out[rows] = np.einsum("ij,ij->i", residuals, residuals)
+    return out
+
+
+def residual_ssq_per_component(
+    X: np.ndarray, scores: np.ndarray, loadings: np.ndarray, block_size: int = 1024
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the sums of squares of the residuals `X - scores[:, :a] @ loadings[:, :a].T`, after each component.
+
+    Returns the sums of squares per row (N x A) and per column (K x A). The rows are deflated one block
+    of `block_size` rows at a time, so only that block of `X` is ever copied.
+    """
+    N, K = X.shape
+    A = scores.shape[1]
+    row_ssq = np.empty((N, A))
+    col_ssq = np.zeros((K, A))
+    for start in range(0, N, block_size):
+        rows = slice(start, start + block_size)
+        residuals = np.array(X[rows], dtype=np.float64, order="C")
+        for a in range(A):
+            _rank_one_update(residuals, scores[rows, a], loadings[:, a])
+            row_ssq[rows, a] = np.einsum("ij,ij->i", residuals, residuals)
+            col_ssq[:, a] += np.einsum("ij,ij->j", residuals, residuals)
+    return row_ssq, col_ssq
+
+
+def _rank_one_update(A: np.ndarray, x: np.ndarray, y: np.ndarray, alpha: float = -1.0) -> None:
+    """Update `A` in place, to `A + alpha * outer(x, y)`; by default this subtracts the outer product.
+
+    This is the BLAS rank-1 update (GER), which works directly on the memory of `A`, so the outer
+    product is never created. A C-ordered `A` is updated through its (Fortran-ordered) transpose.
+    Missing values (NaN) in `A` remain missing. BLAS does not respect read-only memory, so a read-only
+    `A` is left to NumPy, which raises a `ValueError`.
+    """
+    blas_ok = A.dtype in (np.float32, np.float64) and A.flags.writeable
+    if blas_ok and A.flags.f_contiguous:
+        get_blas_funcs("ger", (A,))(alpha, x, y, a=A, overwrite_a=True)
+    elif blas_ok and A.flags.c_contiguous:
+        get_blas_funcs("ger", (A,))(alpha, y, x, a=A.T, overwrite_a=True)
+    else:
+        A += (alpha * x)[:, np.newaxis] @ y[np.newaxis, :]
+
+
+@njit(cache=True, parallel=True)
+def _score_batch(
+    X: np.ndarray, components: np.ndarray, inv_variance: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Project each row of `X` onto the PCA `components`, returning the scores, T2 and residual sum of squares.
+
+    Each row is handled independently (and in parallel), in a single pass: the scores, Hotelling's T2
+    and the residuals are accumulated together, without creating any N x K temporary arrays.
+    A row with missing values (NaN) gives NaN results. (Not compiled with `fastmath`: that would
+    assume there are no NaN values.)
+    """
+    N, K = X.shape
+    A = components.shape[0]
+    scores = np.empty((N, A))
+    hotellings_t2 = np.empty(N)
+    residual_ssq = np.empty(N)
+    for i in prange(N):
+        residual = X[i].copy()
+        t2 = 0.0
+        for a in range(A):
+            t_a = 0.0
+            for k in range(K):
+                t_a += X[i, k] * components[a, k]
+            scores[i, a] = t_a
+            t2 += t_a * t_a * inv_variance[a]
+            for k in range(K):
+                residual[k] -= t_a * components[a, k]
+        hotellings_t2[i] = t2
+        residual_ssq[i] = np.sum(residual * residual)
+    return scores, hotellings_t2, residual_ssq
+
+
+@njit(cache=True)
+def _nipals_pls_iterate(
+    X: np.ndarray, Y: np.ndarray, tol: float, max_iter: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """Iterate the NIPALS algorithm for one PLS component, until the Y-scores converge.
+
+    Missing values (NaN) in `X` and `Y` are skipped in each regression, as in `quick_regress`.
+    Returns the X-scores, Y-scores, X-weights, Y-loadings, and the number of iterations.
+    (Not compiled with `fastmath`: that would assume there are no NaN values.)
+    """
+    X_present = (~np.isnan(X)).astype(np.float64)
+    Y_present = (~np.isnan(Y)).astype(np.float64)
+    X_filled = np.where(np.isnan(X), 0.0, X)
+    Y_filled = np.where(np.isnan(Y), 0.0, Y)
+
+    # Start from the first column in Y (missing values replaced with zeros).
+    u_a_guess = Y_filled[:, 0].copy()
+    u_a = u_a_guess + 1.0
+    itern = 0
+    while np.linalg.norm(u_a_guess - u_a) >= tol and itern <= max_iter:
+        u_a_guess = u_a
+
+        # 1: Regress the score, u_a, onto every column in X: w_a = X'u_a / (u_a'u_a)
+        w_a = _regress_present(X_filled.T @ u_a, X_present.T @ (u_a * u_a))
+
+        # 2: Normalize w_a to unit length
+        w_a /= np.sqrt(np.sum(w_a * w_a))
+
+        # 3: Regress each row in X on the w_a vector: t_a = X w_a / (w_a'w_a)
+        t_a = _regress_present(X_filled @ w_a, X_present @ (w_a * w_a))
+
+        # 4: Regress the score, t_a, onto every column in Y: c_a = Y't_a / (t_a't_a)
+        c_a = _regress_present(Y_filled.T @ t_a, Y_present.T @ (t_a * t_a))
+
+        # 5: Regress each row in Y on the c_a vector: u_a = Y c_a / (c_a'c_a)
+        u_a = _regress_present(Y_filled @ c_a, Y_present @ (c_a * c_a))
+        itern += 1
+
+    return t_a, u_a, w_a, c_a, itern
+
+
+@njit(cache=True)
+def _regress_present(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divide by the denominator, but leave the numerator as-is where the denominator is ~0, as `quick_regress` does."""
+    out = numerator.copy()
+    for i in range(out.shape[0]):
+        if np.abs(denominator[i]) > epsqrt:
+            out[i] /= denominator[i]
+    return out
+
+
 def terminate_check(t_a_guess: np.ndarray, t_a: np.ndarray, iterations: int, settings: dict) -> bool:
     """Terminate the PCA iterative algorithm when any one of these conditions is True.
 
@@ -1151,9 +1489,12 @@ def scale(X, func=np.std, axis=0, extra_output=False, **kwargs):
         return np.multiply(X, vector)
 
 
+@lru_cache(maxsize=64)
 def T2_limit(conf_level: float = 0.95, n_components: int = 0, n_rows: int = 0) -> float:
     """Return the Hotelling's T2 value at the given level of confidence.
 
+    Results are cached, since the limit only depends on these three scalar inputs.
+
     Parameters
     ----------
     conf_level : float, optional
@@ -1170,7 +1511,18 @@ def T2_limit(conf_level: float = 0.95, n_components: int = 0, n_rows: int = 0) -
     a, n = n_components, n_rows
     if a == n:
         return float("inf")
-    return a * (n - 1) * (n + 1) / (n * (n - a)) * f.isf((1 - conf_level), a, n - a)
+    if conf_level <= 0.999:
+        # `fdtri` is the quantile of the F-distribution, without the overhead of `scipy.stats.f.isf`.
+        quantile = fdtri(a, n - a, conf_level)
+    else:
+        # In the extreme upper tail `fdtri` can be inaccurate, so rather solve for the quantile
+        # directly from the survival function. With few degrees of freedom the tail is so heavy
+        # that the quantile can be huge: grow the bracket from the `fdtri` estimate until it holds it.
+        upper = max(fdtri(a, n - a, conf_level), 1.0)
+        while fdtrc(a, n - a, upper) > 1 - conf_level:
+            upper *= 10.0
+        quantile = brentq(lambda x: fdtrc(a, n - a, x) - (1 - conf_level), 0.0, upper)
+    return a * (n - 1) * (n + 1) / (n * (n - a)) * quantile
 
 
 def SPE_limit(model, conf_level=0.95) -> float:
@@ -1182,12 +1534,12 @@ def SPE_limit(model, conf_level=0.95) -> float:
     )
 
 
-def spe_calculation(spe_values: pd.Series, conf_level: float = 0.95) -> float:
+def spe_calculation(spe_values: pd.Series | np.ndarray, conf_level: float = 0.95) -> float:
     """Return a limit for SPE (squared prediction error) at the given level of confidence.
 
     Parameters
     ----------
-    spe_values : pd.Series
+    spe_values : pd.Series or np.ndarray
         The SPE values from the last component in the multivariate model.
     conf_level : [float], optional
         The confidence level, by default 0.95, i.e. the 95% confidence level.
@@ -1203,13 +1555,23 @@ def spe_calculation(spe_values: pd.Series, conf_level: float = 0.95) -> float:
 
     # The limit is for the squares (i.e. the sum of the squared errors)
     # I.e. `spe_values` are square-rooted outside this function, so undo that.
-    values = spe_values**2
-    center_spe = values.mean()
-    variance_spe = values.var(ddof=1)
+    values = np.square(np.asarray(spe_values, dtype=float))
+    center_spe = np.mean(values)
+    variance_spe = np.var(values, ddof=1)
+    return _spe_limit_from_moments(conf_level, float(center_spe), float(variance_spe))
+
+
+@lru_cache(maxsize=64)
+def _spe_limit_from_moments(conf_level: float, center_spe: float, variance_spe: float) -> float:
+    """Return the SPE limit, from the mean and variance of the squared SPE values.
+
+    Cached, since the chi2 inverse is repeatedly requested at the same confidence levels.
+    """
     g = variance_spe / (2 * center_spe)
     h = (2 * (center_spe**2)) / variance_spe
     # Report square root again as SPE limit
-    return np.sqrt(chi2.ppf(conf_level, h) * g)
+    # `chdtri` is the inverse of the chi2 survival function: the same as `scipy.stats.chi2.ppf`.
+    return np.sqrt(chdtri(h, 1 - conf_level) * g)
 
 
 def ellipse_coordinates(  # noqa: PLR0913
@@ -1271,13 +1633,25 @@ def ellipse_coordinates(  # noqa: PLR0913
     s_h = scaling_factor_for_scores.iloc[score_horiz - 1]
     s_v = scaling_factor_for_scores.iloc[score_vert - 1]
     T2_limit_specific = np.sqrt(T2_limit(T2_limit_conf_level, n_components=n_components, n_rows=n_rows))
-    dt = 2 * np.pi / (n_points - 1)
-    steps = np.linspace(0, n_points - 1, n_points)
-    x = np.cos(steps * dt) * T2_limit_specific * s_h
-    y = np.sin(steps * dt) * T2_limit_specific * s_v
+    cos_theta, sin_theta = _unit_circle(n_points)
+    x = (T2_limit_specific * s_h) * cos_theta
+    y = (T2_limit_specific * s_v) * sin_theta
     return x, y
 
 
+@lru_cache(maxsize=8)
+def _unit_circle(n_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the cosine and sine of `n_points` equispaced angles from 0 to 2*pi, inclusive.
+
+    These only depend on `n_points`, so they are cached (as read-only arrays) across ellipses.
+    """
+    theta = np.linspace(0.0, 2 * np.pi, n_points)
+    cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+    cos_theta.flags.writeable = False
+    sin_theta.flags.writeable = False
+    return cos_theta, sin_theta
+
+
 # def _apply_pca(self, new=None):
 #     """
 #     Project new observations, ``new``, onto the existing latent variable
@@ -35,10 +35,10 @@ setuptools.setup(
         "statsmodels",
         "matplotlib",
         "bokeh",
-        "scikit-learn",
+        "scikit-learn>=1.3",
         "patsy",
         "scikit-image",
-        "scikit-learn",
+        "scikit-learn>=1.3",
         "plotly",
         "numba",
         "seaborn",
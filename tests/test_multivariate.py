@@ -1,10 +1,13 @@
 # (c) Kevin Dunn, 2010-2024. MIT License.
 
+import os
 import pathlib
 
 import numpy as np
 import pandas as pd
 import pytest
+from scipy.linalg import eigh
+from sklearn import decomposition
 from sklearn.cross_decomposition import PLSRegression
 
 from process_improve.multivariate.methods import (
@@ -12,6 +15,7 @@ from process_improve.multivariate.methods import (
     PLS,
     MCUVScaler,
     SpecificationWarning,
+    T2_limit,
     center,
     epsqrt,
     quick_regress,
@@ -19,6 +23,26 @@ from process_improve.multivariate.methods import (
     ssq,
 )
 
+_DATA_FOLDER = pathlib.Path(__file__).parents[1] / "process_improve" / "datasets" / "multivariate"
+_SPECTRA_PATH = _DATA_FOLDER / "tablet-spectra.csv"
+
+
+def _mcuv(*arrays) -> tuple[np.ndarray, ...]:
+    """
+    Mean center and scale the columns of each array to unit variance (ddof=1), as `MCUVScaler` does,
+    but in a single expression which writes into one output array. For complete data only.
+
+    A tuple is always returned, with one scaled array per input: `(X,) = _mcuv(X)` or `X, Y = _mcuv(X, Y)`.
+    """
+    scaled = []
+    for array in arrays:
+        values = np.asarray(array, dtype=np.float64)
+        out = np.empty_like(values)
+        np.subtract(values, values.mean(axis=0), out=out)
+        np.divide(out, values.std(axis=0, ddof=1), out=out)
+        scaled.append(out)
+    return tuple(scaled)
+
 
 def test_pca_spe_limits():
     """Simulate data and see if SPE limit cuts off at 5%."""
@@ -33,9 +57,7 @@ def test_pca_spe_limits():
         # The desired covariance matrix.
         r = np.array([[5.20, -4.98, -1.00], [-4.98, 5.50, 2.94], [-1.00, 2.94, 2.77]])
 
-        X = pd.DataFrame(np.random.multivariate_normal(mu, r, size=N))
-        scaler = MCUVScaler().fit(X)
-        mcuv = scaler.fit_transform(X)
+        (mcuv,) = _mcuv(np.random.multivariate_normal(mu, r, size=N))
 
         A = 2
         pca = PCA(n_components=A).fit(mcuv)
@@ -49,17 +71,38 @@ def test_pca_spe_limits():
     assert np.mean(outliers_99) == pytest.approx(0.01 * N, rel=0.1)
 
 
-def test_PCA_foods():
-    """Arrays with no variance should not be able to have variance extracted."""
+def _cache_dir(request, name: str) -> pathlib.Path:
+    """Return pytest's cache directory `name`, or a temporary directory if the cache provider plugin is disabled."""
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return request.getfixturevalue("tmp_path_factory").mktemp(name)
+    return cache.mkdir(name)
 
-    foods = pd.read_csv("https://openmv.net/file/food-texture.csv").drop(
+
+@pytest.fixture(scope="session")
+def fixture_food_texture(request):
+    """
+    The food texture data set. It is only downloaded once, and then kept in pytest's cache
+    directory, so later test runs (and the other test workers) read it from disk.
+    """
+    cached = _cache_dir(request, "food-texture") / "food-texture.csv"
+    if not cached.exists():
+        downloaded = cached.with_name(f"{cached.stem}-{os.getpid()}.download")
+        pd.read_csv("https://openmv.net/file/food-texture.csv").to_csv(downloaded, index=False)
+        downloaded.replace(cached)
+
+    return pd.read_csv(cached).drop(
         [
             "Unnamed: 0",
         ],
         axis=1,
     )
-    scaler = MCUVScaler().fit(foods)
-    foods_mcuv = scaler.fit_transform(foods)
+
+
+def test_PCA_foods(fixture_food_texture):
+    """Arrays with no variance should not be able to have variance extracted."""
+
+    foods_mcuv = MCUVScaler().fit_transform(fixture_food_texture)
 
     A = 2
     pca = PCA(n_components=A).fit(foods_mcuv)
@@ -78,11 +121,23 @@ def test_PCA_foods():
     assert ellipse_y[-1] == pytest.approx(0, rel=1e-7)
 
 
+@pytest.mark.parametrize("conf_level", [0.95, 0.999, 0.99999, 0.99999999])
+@pytest.mark.parametrize("N", [3, 5, 5000])
+def test_T2_limit_matches_f_distribution(conf_level, N):
+    """The T2 limit must agree with the F-distribution, also in the extreme tail and for few degrees of freedom."""
+    # With 2 numerator degrees of freedom the survival function of the F-distribution has the closed form
+    # (1 + 2x/dfd)^(-dfd/2), which can be inverted exactly to give an independent reference quantile.
+    A = 2
+    dfd = N - A
+    quantile = dfd / 2 * ((1 - conf_level) ** (-2 / dfd) - 1)
+    expected = A * (N - 1) * (N + 1) / (N * (N - A)) * quantile
+    assert T2_limit(conf_level, n_components=A, n_rows=N) == pytest.approx(expected, rel=1e-9)
+
+
 @pytest.fixture()
 def fixture_kamyr_data_missing_value():
-    folder = pathlib.Path(__file__).parents[1] / "process_improve" / "datasets" / "multivariate"
     return pd.read_csv(
-        folder / "kamyr.csv",
+        _DATA_FOLDER / "kamyr.csv",
         index_col=None,
         header=None,
     )
@@ -148,18 +203,15 @@ def test_ssq(fixture_mv_utilities):
 def test_quick_regress(fixture_mv_utilities):
     x, Y = fixture_mv_utilities
     out = quick_regress(Y, x).ravel()
-    assert pytest.approx(out[0], abs=1e-9) == 1
-    assert pytest.approx(out[1], abs=1e-8) == 0.61538462
-    assert pytest.approx(out[2], abs=1e-9) == 0
-
-    # Checked against R: summary(lm(c(1,1,1,1,1,1) ~ seq(6) + 0))
-    assert pytest.approx(out[3], abs=1e-6) == 0.23077
 
-    # Checked against what is expected: (1 + 3^2 + 5^2)/(1 + 3^2 + 5^2)
-    assert pytest.approx(out[4], abs=1e-14) == 1.0
+    # The regression coefficients are sum(x * y) / sum(x^2), with sum(x^2) = 91, so 56/91 = 8/13
+    # for the second column. For the 4th column, 21/91 = 3/13 = 0.23077, checked against R:
+    # summary(lm(c(1,1,1,1,1,1) ~ seq(6) + 0)). For the last column, with missing values, it is
+    # expected to be: (1 + 3^2 + 5^2)/(1 + 3^2 + 5^2)
+    np.testing.assert_allclose(out, [1.0, 8 / 13, 0.0, 3 / 13, 1.0], rtol=0, atol=1e-14)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fixture_tablet_spectra_data():
     """
     Verifies the PCA model for the case of no missing data.
@@ -193,9 +245,8 @@ def fixture_tablet_spectra_data():
     PC3 -1.134026e-11 2.042206e-10  5.951125e+03 7.815970e-13
     PC4  3.454659e-11 5.821477e-11  7.815970e-13 4.910481e+03
     """
-    folder = pathlib.Path(__file__).parents[1] / "process_improve" / "datasets" / "multivariate"
     spectra = pd.read_csv(
-        folder / "tablet-spectra.csv",
+        _SPECTRA_PATH,
         index_col=0,
         header=None,
     )
@@ -209,27 +260,47 @@ def fixture_tablet_spectra_data():
             [0, 0, 0, 4.910481e03],
         ]
     )
-    return spectra, known_scores_covar
+    # Shared by all the tests in the session: they must not modify these values.
+    autoscaled_X = scale(center(spectra))
+    return spectra, autoscaled_X, known_scores_covar
+
 
+@pytest.fixture(scope="session")
+def fixture_tablet_spectra_mcuv(fixture_tablet_spectra_data):
+    """The tablet spectra, mean centered and scaled to unit variance, once for the whole session."""
+    spectra, _, _ = fixture_tablet_spectra_data
+    return MCUVScaler().fit_transform(spectra)
 
-def test_MCUV_centering(fixture_tablet_spectra_data):
+
+def test_MCUV_centering(fixture_tablet_spectra_mcuv):
     """Mean centering of the testing data."""
 
-    spectra, _ = fixture_tablet_spectra_data
-    X_mcuv = MCUVScaler().fit_transform(spectra)
+    X_mcuv = fixture_tablet_spectra_mcuv
     assert pytest.approx(np.max(np.abs(X_mcuv.mean(axis=0))), rel=1e-9) == 0.0
 
 
-def test_MCUV_scaling(fixture_tablet_spectra_data):
+def test_MCUV_scaling(fixture_tablet_spectra_mcuv):
     """Scaling by standard deviation."""
 
-    spectra, _ = fixture_tablet_spectra_data
-    X_mcuv = MCUVScaler().fit_transform(spectra)
+    X_mcuv = fixture_tablet_spectra_mcuv
 
     assert pytest.approx(np.min(np.abs(X_mcuv.std(axis=0))), 1e-10) == 1
     assert pytest.approx(X_mcuv.std(), 1e-10) == 1
 
 
+def test_mcuv_matches_columns_by_name():
+    """Columns of a DataFrame are matched by name; arrays without column names by position."""
+    X = pd.DataFrame({"a": [1.0, 2.0, 4.0], "b": [100.0, 300.0, 500.0]})
+    scaler = MCUVScaler().fit(X)
+    expected = scaler.transform(X)
+
+    pd.testing.assert_frame_equal(scaler.transform(X[["b", "a"]]), expected)
+    pd.testing.assert_frame_equal(scaler.inverse_transform(expected[["b", "a"]]), X)
+    np.testing.assert_allclose(scaler.transform(X.to_numpy()).to_numpy(), expected.to_numpy())
+    with pytest.raises(ValueError, match="column names"):
+        scaler.transform(X.rename(columns={"b": "c"}))
+
+
 def test_pca_tablet_spectra(fixture_tablet_spectra_data):
     r"""
     Check PCA characteristics.
@@ -254,11 +325,11 @@ def test_pca_tablet_spectra(fixture_tablet_spectra_data):
     * :math:`\text{SVD}(X): UDV' = X` and :math:`V' = P'` and :math:`UD = T`
     """
 
-    spectra, known_scores_covar = fixture_tablet_spectra_data
+    _, autoscaled_X, known_scores_covar = fixture_tablet_spectra_data
 
     # Number of components to calculate
     model = PCA(n_components=2)
-    model.fit(scale(center(spectra)))
+    model.fit(autoscaled_X)
 
     # P'P = identity matrix of size A x A
     orthogonal_check = model.loadings.T @ model.loadings
@@ -270,30 +341,156 @@ def test_pca_tablet_spectra(fixture_tablet_spectra_data):
 
     # Unit length: actually checked above, via subtraction with I matrix.
     # Check if scores are orthogonal
-    scores_covar = model.x_scores.T @ model.x_scores
-    for i in range(model.A):
-        for j in range(model.A):
-            # Technically not need, but more explict this way.
-            if i == j:
-                assert scores_covar.iloc[i, j] == pytest.approx(known_scores_covar[i, j], rel=1e-2)
-            else:
-                assert scores_covar.iloc[i, j] == pytest.approx(known_scores_covar[i, j], abs=1e-4)
-
-                if i >= 1:
-                    assert scores_covar.iloc[j, j] > scores_covar.iloc[i, i]
-
-    # Check the model against an SVD: this raw data set has no missing
-    # data, so the SVD should be faster and more accurate than NIPALS
-    autoscaled_X = scale(center(spectra))
-    u, s, v = np.linalg.svd(autoscaled_X)
-
-    loadings_delta = np.linalg.norm(np.abs(v[0 : model.A, :]) - np.abs(model.loadings.T))
+    scores_covar = (model.x_scores.T @ model.x_scores).to_numpy()
+    known_scores_covar = known_scores_covar[: model.A, : model.A]
+    diagonal = np.diag(scores_covar)
+    np.testing.assert_allclose(diagonal, np.diag(known_scores_covar), rtol=1e-2)
+    np.testing.assert_allclose(scores_covar - np.diag(diagonal), 0, atol=1e-4)
+
+    # Each earlier score's variance must exceed the variance of the later scores
+    assert np.all(np.diff(diagonal) < 0)
+
+    # Check the model against the eigenvectors of X'X: this raw data set has no missing
+    # data, so these should be faster and more accurate than NIPALS. Only the leading
+    # eigenvectors (the right singular vectors of X) are needed.
+    XtX = autoscaled_X.T.to_numpy() @ autoscaled_X.to_numpy()
+    _, v = eigh(XtX, subset_by_index=[XtX.shape[0] - model.A, XtX.shape[0] - 1])
+    v = v[:, ::-1].T
+
+    loadings_delta = np.linalg.norm(np.abs(v) - np.abs(model.loadings.T))
     assert loadings_delta == pytest.approx(0, abs=1e-8)
 
     # It is not possible, it seems, to get the scores to match the SVD
     # scores. Numerical error?
 
 
+def test_pca_wide_data_matches_sklearn():
+    """With fewer rows than columns the model is fitted from the Gram matrix: compare to sklearn."""
+    N, K, A = 20, 150, 3
+    X = pd.DataFrame(np.random.default_rng(13).normal(size=(N, K)))
+    model = PCA(n_components=A).fit(X)
+    reference = decomposition.PCA(n_components=A).fit(X)
+
+    np.testing.assert_allclose(model.components_, reference.components_, rtol=0, atol=1e-10)
+    np.testing.assert_allclose(model.x_scores.values, reference.transform(X), rtol=0, atol=1e-10)
+    assert model.explained_variance_ == pytest.approx(reference.explained_variance_, rel=1e-10)
+    assert model.explained_variance_ratio_ == pytest.approx(reference.explained_variance_ratio_, rel=1e-10)
+    assert model.noise_variance_ == pytest.approx(reference.noise_variance_, rel=1e-10)
+
+
+def test_pca_wide_data_with_large_offsets_matches_sklearn():
+    """The Gram matrix must be formed from explicitly centered data: large column means may not lose accuracy."""
+    N, K, A = 20, 150, 3
+    X = np.random.default_rng(5).normal(size=(N, K)) * np.linspace(1, 3, K) + 1e6
+    model = PCA(n_components=A).fit(X)
+    reference = decomposition.PCA(n_components=A, svd_solver="full").fit(X)
+
+    np.testing.assert_allclose(model.components_, reference.components_, rtol=0, atol=1e-9)
+    assert model.explained_variance_ == pytest.approx(reference.explained_variance_, rel=1e-10)
+
+
+def test_pca_single_precision():
+    """Fitting in single precision must give practically the same model statistics and limits."""
+    N, K, A = 500, 12, 3
+    rng = np.random.default_rng(7)
+    (X,) = _mcuv(rng.normal(size=(N, K)) @ rng.normal(size=(K, K)))
+    model_64 = PCA(n_components=A).fit(X)
+    model_32 = PCA(n_components=A, dtype=np.float32).fit(X)
+
+    assert model_32.components_.dtype == np.float32
+    assert model_32.explained_variance_.dtype == np.float64
+    assert model_32.explained_variance_ == pytest.approx(model_64.explained_variance_, rel=1e-5)
+    assert model_32.SPE_limit(conf_level=0.95) == pytest.approx(model_64.SPE_limit(conf_level=0.95), rel=1e-5)
+    assert model_32.Hotellings_T2.values == pytest.approx(model_64.Hotellings_T2.values, rel=1e-3, abs=1e-5)
+
+
+def test_pca_single_precision_close_fit():
+    """In single precision, a close fit to low-rank data must still give SPE and R2 values close to double precision."""
+    N, K, A = 300, 12, 3
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(N, A)) @ rng.normal(size=(A, K)) + 1e-4 * rng.normal(size=(N, K))
+    X -= X.mean(axis=0)
+    model_64 = PCA(n_components=A).fit(X)
+    model_32 = PCA(n_components=A, dtype=np.float32).fit(X)
+
+    spe_64 = model_64.squared_prediction_error.values
+    np.testing.assert_allclose(model_32.squared_prediction_error.values, spe_64, rtol=1e-2)
+    # The unexplained fraction left after the last component is about 1e-9: it must still be resolved
+    np.testing.assert_allclose(1 - model_32.R2X_cum.values[:, -1], 1 - model_64.R2X_cum.values[:, -1], rtol=1e-3)
+    np.testing.assert_allclose(1 - model_32.R2cum.values[-1], 1 - model_64.R2cum.values[-1], rtol=1e-3)
+
+
+def test_pca_single_precision_gram_fallback():
+    """With N << K, a component too small to resolve from the single precision Gram matrix needs the SVD instead."""
+    N, K, A = 20, 200, 3
+    rng = np.random.default_rng(1)
+    U, _ = np.linalg.qr(rng.normal(size=(N, N)))
+    V, _ = np.linalg.qr(rng.normal(size=(K, N)))
+    singular_values = np.concatenate([[100.0, 10.0, 0.03], np.full(N - 3, 1e-5)])
+    X = (U * singular_values) @ V.T
+    X -= X.mean(axis=0)
+
+    model = PCA(n_components=A, dtype=np.float32).fit(X)
+    reference = decomposition.PCA(n_components=A, svd_solver="full").fit(X.astype(np.float32))
+    np.testing.assert_allclose(model.explained_variance_, reference.explained_variance_, rtol=1e-5)
+
+
+def test_pca_single_precision_uncentered_wide_data():
+    """In single precision, wide data with large column means must give the same model as in double precision."""
+    N, K, A = 20, 150, 3
+    X = np.random.default_rng(5).normal(size=(N, K)) * np.linspace(1, 3, K) + 1e3
+    model_64 = PCA(n_components=A).fit(X)
+    model_32 = PCA(n_components=A, dtype=np.float32).fit(X)
+
+    np.testing.assert_allclose(model_32.explained_variance_, model_64.explained_variance_, rtol=1e-4)
+    np.testing.assert_allclose(model_32.components_, model_64.components_, rtol=0, atol=1e-4)
+
+
+def test_pca_spe_of_close_fit():
+    """The SPE values must stay accurate when the model fits the data closely, i.e. the residuals are tiny."""
+    N, K, A = 300, 10, 3
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(N, A)) @ rng.normal(size=(A, K)) + 1e-6 * rng.normal(size=(N, K))
+    X -= X.mean(axis=0)
+    model = PCA(n_components=A).fit(X)
+
+    residuals = X - model.x_scores.values @ model.x_loadings.values.T
+    expected_spe = np.sqrt(np.einsum("ij,ij->i", residuals, residuals))
+    np.testing.assert_allclose(model.squared_prediction_error.iloc[:, -1].values, expected_spe, rtol=1e-8)
+
+
+def test_pca_predict_matches_fit():
+    """Predicting on the training data must reproduce the model's scores, T2 and SPE values."""
+    N, K, A = 200, 8, 3
+    rng = np.random.default_rng(11)
+    (X,) = _mcuv(rng.normal(size=(N, K)) @ rng.normal(size=(K, K)))
+    model = PCA(n_components=A).fit(X)
+    state = model.predict(X)
+
+    np.testing.assert_allclose(state.x_scores.values, model.x_scores.values, rtol=0, atol=1e-10)
+    assert state.Hotellings_T2.values == pytest.approx(model.Hotellings_T2.iloc[:, -1].values, rel=1e-9)
+    assert state.squared_prediction_error.values == pytest.approx(
+        model.squared_prediction_error.iloc[:, -1].values, rel=1e-6
+    )
+
+
+def test_pca_predict_propagates_missing_values():
+    """Missing values are not handled yet in `predict`: a row with a NaN must give NaN, and not affect other rows."""
+    N, K, A = 200, 8, 3
+    rng = np.random.default_rng(11)
+    (X,) = _mcuv(rng.normal(size=(N, K)) @ rng.normal(size=(K, K)))
+    model = PCA(n_components=A).fit(X)
+    X_new = X[:5].copy()
+    X_new[2, 1] = np.nan
+    state = model.predict(X_new)
+
+    assert np.all(np.isnan(state.x_scores.values[2]))
+    assert np.isnan(state.Hotellings_T2.values[2])
+    assert np.isnan(state.squared_prediction_error.values[2])
+    complete = [0, 1, 3, 4]
+    np.testing.assert_allclose(state.x_scores.values[complete], model.x_scores.values[complete], rtol=0, atol=1e-10)
+
+
 def test_pca_errors_no_variance_to_start():
     """Arrays with no variance should seem to work, but should have no variability explained."""
     K, N, A = 17, 12, 5
@@ -332,18 +529,26 @@ def test_PCA_invalid_calls():
     #     model.fit(sparse_data)
 
 
+def _standardized_low_rank_data(N: int, K: int, rank: int, seed: int) -> pd.DataFrame:
+    """Seeded N x K matrix, X = T P', of the given `rank`; centered and scaled to unit variance (ddof=0)."""
+    rng = np.random.default_rng(seed)
+    TP = rng.uniform(low=-1, high=1, size=(N + K, rank))
+    X = TP[:N] @ TP[N:].T
+
+    # Center and scale in-place, then wrap that same array in the data frame.
+    X -= X.mean(axis=0)
+    stdX = X.std(axis=0, ddof=0)
+    np.divide(X, stdX, out=X, where=stdX > 0)
+    return pd.DataFrame(X, copy=False)
+
+
 def test_PCA_no_more_variance():
     """Create a rank 2 matrix and it should fail on the 3rd component."""
 
     K = 17
     N = 12
     A = 3
-    T = np.random.uniform(low=-1, high=1, size=(N, 2))
-    P = np.random.uniform(low=-1, high=1, size=(K, 2))
-    X = T @ P.T
-    meanX = X.mean(axis=0)
-    stdX = X.std(axis=0, ddof=0)
-    X = pd.DataFrame((X - meanX) / stdX)
+    X = _standardized_low_rank_data(N, K, rank=2, seed=42)  # noqa: F841
     _ = PCA(n_components=A)
 
     # with pytest.raises(RuntimeError):
@@ -357,12 +562,7 @@ def test_PCA_columns_with_no_variance():
     N = 29
     A = 4
     cols_with_no_variance = [10, 3]
-    T = np.random.uniform(low=-1, high=1, size=(N, A))
-    P = np.random.uniform(low=-1, high=1, size=(K, A))
-    X = T @ P.T
-    meanX = X.mean(axis=0)
-    stdX = X.std(axis=0, ddof=0)
-    X = pd.DataFrame((X - meanX) / stdX)
+    X = _standardized_low_rank_data(N, K, rank=A, seed=43)
     X.iloc[:, cols_with_no_variance] = 0
 
     m = PCA(n_components=2)
@@ -375,62 +575,58 @@ def test_PCA_columns_with_no_variance():
     assert np.sum(np.identity(m.A) - m.loadings.values.T @ m.loadings.values) == pytest.approx(0, abs=1e-14)
 
     # Are scores orthogonal?
-    covmatrix = m.x_scores.T @ m.x_scores
-    covmatrix - np.diag(np.diag(covmatrix))
-    (np.sum(np.abs(covmatrix - np.diag(np.diag(covmatrix))))).values == pytest.approx(0, abs=1e-6)
+    covmatrix = (m.x_scores.T @ m.x_scores).to_numpy()
+    assert np.sum(np.abs(covmatrix - np.diag(np.diag(covmatrix)))) == pytest.approx(0, abs=1e-6)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fixture_pca_PCA_Wold_etal_paper():
     """
     From the PCA paper by Wold, Esbensen and Geladi, 1987
     Principal Component Analysis, Chemometrics and Intelligent Laboratory
     Systems, v 2, p37-52; http://dx.doi.org/10.1016/0169-7439(87)80084-9
+
+    Returns the raw data, and the centered and scaled data.
     """
-    return pd.DataFrame(np.array([[3, 4, 2, 2], [4, 3, 4, 3], [5.0, 5, 6, 4]]))
+    X = pd.DataFrame(np.array([[3, 4, 2, 2], [4, 3, 4, 3], [5.0, 5, 6, 4]]))
+    return X, scale(center(X))
 
 
 def test_PCA_Wold_centering(fixture_pca_PCA_Wold_etal_paper):
     """Checks the centering step"""
-    out, centering = center(fixture_pca_PCA_Wold_etal_paper, extra_output=True)
+    X, _ = fixture_pca_PCA_Wold_etal_paper
+    out, centering = center(X, extra_output=True)
     assert centering == pytest.approx([4, 4, 4, 3], rel=1e-8)
 
 
 def test_PCA_Wold_scaling(fixture_pca_PCA_Wold_etal_paper):
     """Checks the scaling step. Page 40 of the above paper."""
 
-    out, scaling = scale(center(fixture_pca_PCA_Wold_etal_paper), extra_output=True, ddof=1)
+    X, _ = fixture_pca_PCA_Wold_etal_paper
+    out, scaling = scale(center(X), extra_output=True, ddof=1)
     assert scaling == pytest.approx([1, 1, 0.5, 1])
 
 
 def test_PCA_Wold_model_results(fixture_pca_PCA_Wold_etal_paper):
     """Check if the PCA model matches the results in the paper."""
 
-    X_preproc = scale(center(fixture_pca_PCA_Wold_etal_paper))
-    pca_1 = PCA(n_components=1)
-    pca_1.fit(X_preproc.copy())
-
-    # TODO: complete these tests
+    _, X_preproc = fixture_pca_PCA_Wold_etal_paper
 
-    # The remaining sum of squares, on page 43
-    # SS_X = np.sum(pca_1["residuals"].values ** 2, axis=0)
-    # self.assertTrue(
-    #     np.all(compare_entries(SS_X, np.array([0.0551, 1.189, 0.0551, 0.0551]), 3))
-    # )
+    # The components are extracted one at a time, so a single 2 component model also gives the
+    # results for the 1 component model.
+    pca_2 = PCA(n_components=2)
+    pca_2.fit(X_preproc)
 
-    # # The residuals after 1 component
-    # self.assertTrue(
-    #     np.all(compare_entries(SS_X, np.array([0.0551, 1.189, 0.0551, 0.0551]), 3))
-    # )
+    # The remaining sum of squares after 1 component, on page 43. The paper scales each column to
+    # unit variance with N-1 = 2, so each column has a sum of squares of 2 before fitting the model.
+    SS_X = (1 - pca_2.R2X_cum.iloc[:, 0].values) * 2
+    np.testing.assert_allclose(SS_X, [0.0551, 1.189, 0.0551, 0.0551], rtol=0, atol=1e-3)
 
     # # With 2 components, the loadings are, page 40
     # P.T = [ 0.5410, 0.3493,  0.5410,  0.5410],
     #      [-0.2017, 0.9370, -0.2017, -0.2017]
-    X_preproc = scale(center(fixture_pca_PCA_Wold_etal_paper))
-    pca_2 = PCA(n_components=2)
-    pca_2.fit(X_preproc)
-    assert np.abs(pca_2.loadings.values[:, 0]) == pytest.approx([0.5410, 0.3493, 0.5410, 0.5410], abs=1e-4)
-    assert np.abs(pca_2.loadings.values[:, 1]) == pytest.approx([0.2017, 0.9370, 0.2017, 0.2017], abs=1e-4)
+    np.testing.assert_allclose(np.abs(pca_2.loadings.values[:, 0]), [0.5410, 0.3493, 0.5410, 0.5410], rtol=0, atol=1e-4)
+    np.testing.assert_allclose(np.abs(pca_2.loadings.values[:, 1]), [0.2017, 0.9370, 0.2017, 0.2017], rtol=0, atol=1e-4)
 
     # Scores. The scaling is off here by a constant factor of 0.8165
     # assert np.all(pca_2.x_scores["1"] == pytest.approx([-1.6229, -0.3493, 1.9723], rel=1e-3))
@@ -493,7 +689,44 @@ def test_PLS_invalid_calls():
         model.fit(dataX, sparse_data)
 
 
-@pytest.fixture()
+def _score_std(scores) -> np.ndarray:
+    """
+    Sample standard deviation (ddof=1) of each column of `scores`. Calculated from the column sums
+    and sums of squares, so there is no centered copy of the scores, as in `np.std`.
+    """
+    scores = np.asarray(scores)
+    N = scores.shape[0]
+    mean = scores.sum(axis=0) / N
+    return np.sqrt((np.einsum("ij,ij->j", scores, scores) - N * mean**2) / (N - 1))
+
+
+def _assert_allclose_up_to_sign(expected, actual, atol: float) -> None:
+    """
+    The sign of each latent variable is arbitrary: flip the columns of `actual` which point in the
+    opposite direction to those in `expected`, and then compare them element by element.
+    """
+    actual = np.asarray(actual)
+    expected = np.reshape(expected, actual.shape)
+    signs = np.sign(np.einsum("ij,ij->j", expected, actual))
+    np.testing.assert_allclose(actual * signs, expected, rtol=0, atol=atol)
+
+
+def _read_only(data: dict) -> dict:
+    """
+    Mark the NumPy arrays of a session-scoped fixture as read-only, so no test can modify them in place.
+    DataFrames are rebuilt on top of a read-only copy of their values, for the same reason.
+    """
+    for key, value in data.items():
+        if isinstance(value, pd.DataFrame):
+            values = value.to_numpy(copy=True)
+            values.flags.writeable = False
+            data[key] = pd.DataFrame(values, index=value.index, columns=value.columns, copy=False)
+        elif isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return data
+
+
+@pytest.fixture(scope="session")
 def fixture_pls_model_simca_1_component():
     """
     Simple model tested against Simca-P, version 14.1.
@@ -540,94 +773,17 @@ def fixture_pls_model_simca_1_component():
     data["X"] = pd.DataFrame(
         np.array(
             [
-                [
-                    41.1187,
-                    21.2833,
-                    21.1523,
-                    0.2446,
-                    -0.0044,
-                    -0.131,
-                ],
-                [
-                    41.7755,
-                    22.0978,
-                    21.1653,
-                    0.3598,
-                    0.1622,
-                    -0.9325,
-                ],
-                [
-                    41.2568,
-                    21.4873,
-                    20.7407,
-                    0.2536,
-                    0.1635,
-                    -0.7467,
-                ],
-                [
-                    41.5469,
-                    22.2043,
-                    20.4518,
-                    0.6317,
-                    0.1997,
-                    -1.7525,
-                ],
-                [
-                    40.0234,
-                    23.7399,
-                    21.978,
-                    -0.0534,
-                    -0.0158,
-                    -1.7619,
-                ],
-                [
-                    39.9203,
-                    21.9997,
-                    21.5859,
-                    -0.1811,
-                    0.089,
-                    -0.4138,
-                ],
-                [
-                    42.1886,
-                    21.4891,
-                    20.4427,
-                    0.686,
-                    0.1124,
-                    -1.0464,
-                ],
-                [
-                    42.1454,
-                    20.3803,
-                    18.2327,
-                    0.6607,
-                    0.1291,
-                    -2.1476,
-                ],
-                [
-                    42.272,
-                    18.9725,
-                    18.3763,
-                    0.561,
-                    0.0453,
-                    -0.5962,
-                ],
-                [
-                    41.49,
-                    18.603,
-                    17.9978,
-                    0.4872,
-                    0.1198,
-                    -0.6052,
-                ],
-                [
-                    41.5306,
-                    19.1558,
-                    18.2172,
-                    0.6233,
-                    0.1789,
-                    -0.9386,
-                ],
+                [41.1187, 21.2833, 21.1523, 0.2446, -0.0044, -0.131],
+                [41.7755, 22.0978, 21.1653, 0.3598, 0.1622, -0.9325],
+                [41.2568, 21.4873, 20.7407, 0.2536, 0.1635, -0.7467],
+                [41.5469, 22.2043, 20.4518, 0.6317, 0.1997, -1.7525],
+                [40.0234, 23.7399, 21.978, -0.0534, -0.0158, -1.7619],
+                [39.9203, 21.9997, 21.5859, -0.1811, 0.089, -0.4138],
+                [42.1886, 21.4891, 20.4427, 0.686, 0.1124, -1.0464],
+                [42.1454, 20.3803, 18.2327, 0.6607, 0.1291, -2.1476],
+                [42.272, 18.9725, 18.3763, 0.561, 0.0453, -0.5962],
+                [41.49, 18.603, 17.9978, 0.4872, 0.1198, -0.6052],
+                [41.5306, 19.1558, 18.2172, 0.6233, 0.1789, -0.9386],
             ]
         )
     )
@@ -730,7 +886,12 @@ def fixture_pls_model_simca_1_component():
     data["Yws"] = 1 / 6.826007  # Simca-P uses inverse standard deviation
     data["A"] = 1
     data["conf"] = 0.95
-    return data
+
+    # The same names as in the 2-component fixture, for the tests which use both.
+    data["T"] = data["t1"]
+    data["loadings_P"] = data["loadings_P1"]
+    data["loadings_W"] = data["loadings_r1"]
+    return _read_only(data)
 
 
 def test_PLS_compare_sklearn_1_component(fixture_pls_model_simca_1_component):
@@ -740,22 +901,22 @@ def test_PLS_compare_sklearn_1_component(fixture_pls_model_simca_1_component):
     plsmodel.fit(data["X"], data["y"])
 
     # Check the pre-processing: sig figs have been taken as high as possible.
-    assert plsmodel._x_mean == pytest.approx(data["Xavg"], abs=1e-5)
-    assert plsmodel._x_std == pytest.approx(data["Xws"], abs=1e-6)
-    assert plsmodel._y_mean == pytest.approx(data["Yavg"], abs=1e-7)
-    assert plsmodel._y_std == pytest.approx(data["Yws"], abs=1e-8)
+    np.testing.assert_allclose(plsmodel._x_mean, data["Xavg"], rtol=0, atol=1e-5)
+    np.testing.assert_allclose(plsmodel._x_std, data["Xws"], rtol=0, atol=1e-6)
+    np.testing.assert_allclose(plsmodel._y_mean, data["Yavg"], rtol=0, atol=1e-7)
+    np.testing.assert_allclose(plsmodel._y_std, data["Yws"], rtol=0, atol=1e-8)
 
     # Extract the model parameters
     T = plsmodel.x_scores_
     P = plsmodel.x_loadings_
-    assert T.ravel() == pytest.approx(data["t1"], abs=1e-5)
-    assert np.std(T, ddof=1) == pytest.approx(data["SDt"], rel=1e-5)
+    np.testing.assert_allclose(T.ravel(), data["t1"], rtol=0, atol=1e-5)
+    assert _score_std(T) == pytest.approx(data["SDt"], rel=1e-5)
     assert data["loadings_P1"].ravel() == pytest.approx(P.ravel(), rel=1e-5)
     assert data["loadings_r1"] == pytest.approx(plsmodel.x_weights_.ravel(), rel=1e-4)
 
     # Check the model's predictions
     t1_predict, y_pp = plsmodel.transform(data["X"], data["y"])
-    assert data["t1"] == pytest.approx(t1_predict.ravel(), abs=1e-5)
+    np.testing.assert_allclose(data["t1"], t1_predict.ravel(), rtol=0, atol=1e-5)
     # assert y_pp == pytest.approx((data["y"] - data["Yavg"]) / data["Yws"], abs=1e-6)
 
     # Manually make the PLS prediction
@@ -782,42 +943,19 @@ def test_PLS_compare_sklearn_1_component(fixture_pls_model_simca_1_component):
     # assert R2_y == pytest.approx(data["R2Y"], abs=1e-6)
 
 
-def test_PLS_compare_model_api(fixture_pls_model_simca_1_component):
+def test_pls_preprocessing_simca_1_component(fixture_pls_model_simca_1_component):
     data = fixture_pls_model_simca_1_component
-    plsmodel = PLS(n_components=data["A"])
-
     X_mcuv = MCUVScaler().fit(data["X"])
     Y_mcuv = MCUVScaler().fit(data["y"])
 
     # Check the pre-processing: sig figs have been taken as high as possible.
-    assert X_mcuv.center_.values == pytest.approx(data["Xavg"], abs=1e-5)
-    assert X_mcuv.scale_.values == pytest.approx(data["Xws"], abs=1e-6)
-    assert Y_mcuv.center_.values == pytest.approx(data["Yavg"], abs=1e-7)
-    assert Y_mcuv.scale_.values == pytest.approx(data["Yws"], abs=1e-8)
+    np.testing.assert_allclose(X_mcuv.center_.values, data["Xavg"], rtol=0, atol=1e-5)
+    np.testing.assert_allclose(X_mcuv.scale_.values, data["Xws"], rtol=0, atol=1e-6)
+    np.testing.assert_allclose(Y_mcuv.center_.values, data["Yavg"], rtol=0, atol=1e-7)
+    np.testing.assert_allclose(Y_mcuv.scale_.values, data["Yws"], rtol=0, atol=1e-8)
 
-    # Extract the model parameters
-    plsmodel.fit(X_mcuv.transform(data["X"]), Y_mcuv.transform(data["y"]))
-    assert data["SDt"] == pytest.approx(np.std(plsmodel.x_scores, ddof=1), abs=1e-5)
-    assert data["t1"] == pytest.approx(plsmodel.x_scores.values.ravel(), abs=1e-5)
-    assert data["loadings_P1"] == pytest.approx(plsmodel.x_loadings.values.ravel(), abs=1e-5)
-    assert data["loadings_r1"] == pytest.approx(plsmodel.x_weights.values.ravel(), abs=1e-6)
-
-    assert data["expected_y_predicted"] == pytest.approx(
-        Y_mcuv.inverse_transform(plsmodel.predictions).values.ravel(), abs=1e-5
-    )
-    assert data["R2Y"] == pytest.approx(plsmodel.R2cum, abs=1e-6)
 
-    # Check the model's predictions
-    state = plsmodel.predict(X_mcuv.transform(data["X"]))
-    assert plsmodel.squared_prediction_error.values.ravel() == pytest.approx(
-        state.squared_prediction_error.values, abs=1e-9
-    )
-    assert data["t1"] == pytest.approx(state.x_scores.values.ravel(), abs=1e-5)
-    assert data["Tsq"] == pytest.approx(state.Hotellings_T2.values.ravel(), abs=1e-5)
-    assert data["expected_y_predicted"] == pytest.approx(Y_mcuv.inverse_transform(state.y_hat).values.ravel(), abs=1e-5)
-
-
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fixture_pls_simca_2_components():
     """
     Simple model tested against Simca-P, version 14.1.
@@ -830,76 +968,20 @@ def fixture_pls_simca_2_components():
     out["X"] = pd.DataFrame(
         np.array(
             [
-                [
-                    1.27472,
-                    0.897732,
-                    -0.193397,
-                ],
-                [
-                    1.27472,
-                    -1.04697,
-                    0.264243,
-                ],
-                [
-                    0.00166722,
-                    1.26739,
-                    1.06862,
-                ],
-                [
-                    0.00166722,
-                    -0.0826556,
-                    -1.45344,
-                ],
-                [
-                    0.00166722,
-                    -1.46484,
-                    1.91932,
-                ],
-                [
-                    -1.27516,
-                    0.849516,
-                    -0.326239,
-                ],
-                [
-                    -1.27516,
-                    -1.06304,
-                    0.317718,
-                ],
-                [
-                    -0.000590006,
-                    1.26739,
-                    1.06862,
-                ],
-                [
-                    -0.000590006,
-                    -0.0826556,
-                    -1.45344,
-                ],
-                [
-                    -0.000590006,
-                    -1.09519,
-                    0.427109,
-                ],
-                [
-                    -1.27516,
-                    0.849516,
-                    -0.326239,
-                ],
-                [
-                    -1.27516,
-                    -1.06304,
-                    0.317718,
-                ],
-                [
-                    1.27398,
-                    0.897732,
-                    -0.193397,
-                ],
-                [
-                    1.27398,
-                    -0.130872,
-                    -1.4372,
-                ],
+                [1.27472, 0.897732, -0.193397],
+                [1.27472, -1.04697, 0.264243],
+                [0.00166722, 1.26739, 1.06862],
+                [0.00166722, -0.0826556, -1.45344],
+                [0.00166722, -1.46484, 1.91932],
+                [-1.27516, 0.849516, -0.326239],
+                [-1.27516, -1.06304, 0.317718],
+                [-0.000590006, 1.26739, 1.06862],
+                [-0.000590006, -0.0826556, -1.45344],
+                [-0.000590006, -1.09519, 0.427109],
+                [-1.27516, 0.849516, -0.326239],
+                [-1.27516, -1.06304, 0.317718],
+                [1.27398, 0.897732, -0.193397],
+                [1.27398, -0.130872, -1.4372],
             ]
         )
     )
@@ -1008,7 +1090,7 @@ def fixture_pls_simca_2_components():
         ]
     )
     out["A"] = 2
-    return out
+    return _read_only(out)
 
 
 def test_pls_sklearn_2_components(fixture_pls_simca_2_components):
@@ -1016,51 +1098,114 @@ def test_pls_sklearn_2_components(fixture_pls_simca_2_components):
 
     plsmodel = PLSRegression(n_components=data["A"], scale=False)
 
-    X_mcuv = MCUVScaler().fit_transform(data["X"])
-    Y_mcuv = MCUVScaler().fit_transform(data["y"])
-
-    plsmodel.fit(X_mcuv, Y_mcuv)
+    plsmodel.fit(*_mcuv(data["X"], data["y"]))
 
     # Extract the model parameters
-    assert np.abs(data["T"]) == pytest.approx(np.abs(plsmodel.x_scores_), abs=1e-5)
-    assert np.std(plsmodel.x_scores_, ddof=1, axis=0) == pytest.approx(data["SDt"], abs=1e-6)
-    assert np.abs(data["loadings_P"]) == pytest.approx(np.abs(plsmodel.x_loadings_), abs=1e-5)
-    assert np.abs(data["loadings_W"]) == pytest.approx(np.abs(plsmodel.x_weights_), abs=1e-5)
-
-
-def test_pls_compare_api(fixture_pls_simca_2_components):
-    data = fixture_pls_simca_2_components
+    _assert_allclose_up_to_sign(data["T"], plsmodel.x_scores_, atol=1e-5)
+    np.testing.assert_allclose(_score_std(plsmodel.x_scores_), data["SDt"], rtol=0, atol=1e-6)
+    _assert_allclose_up_to_sign(data["loadings_P"], plsmodel.x_loadings_, atol=1e-5)
+    _assert_allclose_up_to_sign(data["loadings_W"], plsmodel.x_weights_, atol=1e-5)
+
+
+def test_pls_multiple_y_matches_sklearn():
+    """The weights come from an SVD of X'Y: compare to scikit-learn's NIPALS, iterated to convergence."""
+    N, K, M, A = 40, 8, 3, 4
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.normal(size=(N, K)) @ rng.normal(size=(K, K)))
+    Y = pd.DataFrame(X.values[:, :M] @ rng.normal(size=(M, M)) + rng.normal(size=(N, M)))
+
+    model = PLS(n_components=A).fit(X, Y)
+    reference = PLSRegression(n_components=A, tol=1e-30, max_iter=10000).fit(X, Y)
+    for attribute in ["x_weights_", "y_weights_", "x_loadings_", "y_loadings_", "x_scores_", "y_scores_", "coef_"]:
+        np.testing.assert_allclose(getattr(model, attribute), getattr(reference, attribute), rtol=0, atol=1e-10)
+    np.testing.assert_allclose(PLSRegression.predict(model, X), reference.predict(X), rtol=0, atol=1e-10)
+
+
+@pytest.mark.parametrize(
+    ("fixture_name", "atol_sdt", "atol_weights", "atol_r2"),
+    [
+        ("fixture_pls_model_simca_1_component", 1e-5, 1e-6, 1e-6),
+        ("fixture_pls_simca_2_components", 1e-6, 1e-5, 1e-7),
+    ],
+)
+def test_pls_compare_api(fixture_name, atol_sdt, atol_weights, atol_r2, request):
+    """Compare the PLS model, and its predictions on the training data, against Simca-P."""
+    data = request.getfixturevalue(fixture_name)
 
     plsmodel = PLS(n_components=data["A"])
 
-    X_mcuv = MCUVScaler().fit(data["X"])
-    Y_mcuv = MCUVScaler().fit(data["y"])
-    plsmodel.fit(X_mcuv.transform(data["X"]), Y_mcuv.transform(data["y"]))
-
-    # Extract the model parameters
-    assert data["SDt"] == pytest.approx(np.std(plsmodel.x_scores, ddof=1, axis=0), abs=1e-6)
-    assert np.abs(data["T"]) == pytest.approx(np.abs(plsmodel.x_scores), abs=1e-5)
-    assert np.abs(data["loadings_P"]) == pytest.approx(np.abs(plsmodel.x_loadings), abs=1e-5)
-    assert np.abs(data["loadings_W"]) == pytest.approx(np.abs(plsmodel.x_weights), abs=1e-5)
-    assert Y_mcuv.inverse_transform(plsmodel.predictions).values == pytest.approx(
-        data["expected_y_predicted"], abs=1e-5
+    X, Y = (pd.DataFrame(values) for values in _mcuv(data["X"], data["y"]))
+    plsmodel.fit(X, Y)
+
+    # The predictions are compared in the original units of y.
+    y = np.asarray(data["y"], dtype=np.float64)
+    y_mean, y_std = y.mean(axis=0), y.std(axis=0, ddof=1)
+
+    # Extract the model parameters. The sign of each component is arbitrary.
+    np.testing.assert_allclose(_score_std(plsmodel.x_scores), data["SDt"], rtol=0, atol=atol_sdt)
+    _assert_allclose_up_to_sign(data["T"], plsmodel.x_scores, atol=1e-5)
+    _assert_allclose_up_to_sign(data["loadings_P"], plsmodel.x_loadings, atol=1e-5)
+    _assert_allclose_up_to_sign(data["loadings_W"], plsmodel.x_weights, atol=atol_weights)
+    if data["A"] == 1:
+        # With a single component, the sign must also be the same as Simca-P's.
+        np.testing.assert_allclose(plsmodel.x_scores.values.ravel(), data["t1"], rtol=0, atol=1e-5)
+    np.testing.assert_allclose(
+        (plsmodel.predictions.values * y_std + y_mean).ravel(), data["expected_y_predicted"], rtol=0, atol=1e-5
     )
-    assert sum(data["R2Y"]) == pytest.approx(plsmodel.R2cum.values[-1], abs=1e-7)
+    assert np.sum(data["R2Y"]) == pytest.approx(plsmodel.R2cum.values[-1], abs=atol_r2)
 
     # Check the model's predictions
-    state = plsmodel.predict(X_mcuv.transform(data["X"]))
+    state = plsmodel.predict(X)
     # TODO: a check on SPE vs Simca-P. Here we are doing a check between the SPE from the
     # model building, to model-using, but not against an external library.
-    assert plsmodel.squared_prediction_error.iloc[:, -1].values == pytest.approx(
-        state.squared_prediction_error, abs=1e-10
+    np.testing.assert_allclose(
+        state.squared_prediction_error, plsmodel.squared_prediction_error.iloc[:, -1].values, rtol=0, atol=1e-10
     )
-    assert data["Tsq"] == pytest.approx(state.Hotellings_T2, abs=1e-5)
-    assert data["expected_y_predicted"] == pytest.approx(Y_mcuv.inverse_transform(state.y_hat).values.ravel(), abs=1e-5)
-    assert np.abs(data["T"]) == pytest.approx(np.abs(state.x_scores), abs=1e-5)
+    np.testing.assert_allclose(state.Hotellings_T2, data["Tsq"], rtol=0, atol=1e-5)
+    np.testing.assert_allclose(
+        (np.asarray(state.y_hat) * y_std + y_mean).ravel(), data["expected_y_predicted"], rtol=0, atol=1e-5
+    )
+    _assert_allclose_up_to_sign(data["T"], state.x_scores, atol=1e-5)
+    if data["A"] == 1:
+        np.testing.assert_allclose(state.x_scores.values.ravel(), data["t1"], rtol=0, atol=1e-5)
+
+
+def test_missing_data_fits_leave_read_only_inputs_unchanged(tmp_path):
+    """Models fitted with missing data must not deflate the caller's arrays, also if these are read-only."""
+    rng = np.random.default_rng(4)
+    X = rng.normal(size=(30, 6))
+    Y = X[:, :2] @ rng.normal(size=(2, 3)) + 0.1 * rng.normal(size=(30, 3))
+    X[3, 1] = np.nan
+    np.save(tmp_path / "X.npy", X)
+    np.save(tmp_path / "Y.npy", Y)
+    read_only = [X.copy(), Y.copy()]
+    for values in read_only:
+        values.flags.writeable = False
+    memory_mapped = [np.load(tmp_path / "X.npy", mmap_mode="r"), np.load(tmp_path / "Y.npy", mmap_mode="r")]
+
+    for X_in, Y_in in (read_only, memory_mapped):
+        PLS(n_components=2, missing_data_settings=dict(md_method="scp")).fit(pd.DataFrame(X_in), pd.DataFrame(Y_in))
+        PCA(n_components=2, missing_data_settings=dict(md_method="nipals")).fit(pd.DataFrame(X_in))
+        np.testing.assert_array_equal(X_in, X)
+        np.testing.assert_array_equal(Y_in, Y)
+
+
+def _load_numeric_csv(request, path: pathlib.Path, skiprows: int = 0) -> np.ndarray:
+    """
+    Parse a purely numeric CSV file once, and keep a binary copy of it in pytest's cache directory,
+    so later test runs (and the other test workers) memory-map that copy instead.
+    """
+    cached = _cache_dir(request, "numeric-csv") / f"{path.parent.name}-{path.stem}.npy"
+    if not cached.exists() or cached.stat().st_mtime < path.stat().st_mtime:
+        parsed = cached.with_name(f"{cached.stem}-{os.getpid()}.npy")
+        np.save(parsed, np.loadtxt(path, delimiter=",", skiprows=skiprows, ndmin=2))
+        parsed.replace(cached)
 
+    return np.load(cached, mmap_mode="r")
 
-@pytest.fixture()
-def fixture_PLS_LDPE_example():
+
+@pytest.fixture(scope="session")
+def fixture_PLS_LDPE_example(request):
     """
     No missing data.
     Source: https://openmv.net/info/ldpe
@@ -1098,81 +1243,72 @@ def fixture_PLS_LDPE_example():
     A = 6
     """
     out = {}
-    folder = pathlib.Path(__file__).parents[1] / "process_improve" / "datasets" / "multivariate"
-    values = pd.read_csv(
-        folder / "LDPE" / "LDPE.csv",
-        index_col=0,
-    )
-    out["expected_T"] = pd.read_csv(folder / "LDPE" / "T.csv", header=None)
-    out["expected_P"] = pd.read_csv(folder / "LDPE" / "P.csv", header=None)
-    out["expected_W"] = pd.read_csv(folder / "LDPE" / "W.csv", header=None)
-    out["expected_C"] = pd.read_csv(folder / "LDPE" / "C.csv", header=None)
-    out["expected_U"] = pd.read_csv(folder / "LDPE" / "U.csv", header=None)
-    out["expected_Hotellings_T2_A3"] = pd.read_csv(
-        folder / "LDPE" / "Hotellings_T2_A3.csv",
-        header=None,
-    )
-    out["expected_Hotellings_T2_A6"] = pd.read_csv(
-        folder / "LDPE" / "Hotellings_T2_A6.csv",
-        header=None,
-    )
-    out["expected_Yhat_A6"] = pd.read_csv(
-        folder / "LDPE" / "Yhat_A6.csv",
-        header=None,
-    )
+    folder = _DATA_FOLDER / "LDPE"
+    # All files are purely numeric: parse them with NumPy. The first column in LDPE.csv is the row number.
+    values = _load_numeric_csv(request, folder / "LDPE.csv", skiprows=1)[:, 1:]
+    for name in ("T", "P", "W", "C", "U", "Hotellings_T2_A3", "Hotellings_T2_A6", "Yhat_A6"):
+        out[f"expected_{name}"] = _load_numeric_csv(request, folder / f"{name}.csv")
     out["expected_SD_t"] = np.array([1.872539, 1.440642, 1.216218, 1.141096, 1.059435, 0.9459715])
     out["expected_T2_lim_95_A6"] = 15.2017
     out["expected_T2_lim_99_A6"] = 21.2239
-    out["X"] = values.iloc[:, :14]
-    out["Y"] = values.iloc[:, 14:]
+    out["X"] = np.ascontiguousarray(values[:, :14])
+    out["Y"] = np.ascontiguousarray(values[:, 14:])
     assert out["X"].shape == pytest.approx([54, 14])
     assert out["Y"].shape == pytest.approx([54, 5])
     out["A"] = 6
-    return out
 
+    # Shared by the tests (read-only): the scalers and the scaled data.
+    out["X_mcuv"] = MCUVScaler().fit(out["X"])
+    out["Y_mcuv"] = MCUVScaler().fit(out["Y"])
+    out["X_scaled"] = out["X_mcuv"].transform(out["X"])
+    out["Y_scaled"] = out["Y_mcuv"].transform(out["Y"])
+    return _read_only(out)
 
-def test_pls_simca_ldpe(fixture_PLS_LDPE_example):
-    """Unit test for LDPE case study.
-
-    Parameters
-    ----------
-    PLS_model_SIMCA_LDPE_example : dict
-        Dictionary of raw data and expected outputs from the PLS model.
-    """
-    data = fixture_PLS_LDPE_example
-    plsmodel = PLS(n_components=data["A"])
-
-    X_mcuv = MCUVScaler().fit(data["X"])
-    Y_mcuv = MCUVScaler().fit(data["Y"])
-    plsmodel.fit(X_mcuv.transform(data["X"]), Y_mcuv.transform(data["Y"]))
 
+def _check_pls_outputs(plsmodel: PLS, data: dict, atol: dict) -> None:
+    """Compare a PLS model of the LDPE data to the results from Simca-P, to the given tolerances."""
     # Can only get these to very loosely match
     assert data["expected_T2_lim_95_A6"] == pytest.approx(plsmodel.T2_limit(0.95), rel=1e-1)
     assert data["expected_T2_lim_99_A6"] == pytest.approx(plsmodel.T2_limit(0.99), rel=1e-1)
 
-    assert np.mean(np.abs(data["expected_T"].values) - np.abs(plsmodel.x_scores.values)) == pytest.approx(0, abs=1e-4)
-    assert np.mean(np.abs(data["expected_P"].values) - np.abs(plsmodel.x_loadings.values)) == pytest.approx(0, abs=1e-5)
-    assert np.mean(np.abs(data["expected_W"].values) - np.abs(plsmodel.x_weights.values)) == pytest.approx(0, abs=1e-6)
-    assert np.mean(np.abs(data["expected_C"].values) - np.abs(plsmodel.y_loadings.values)) == pytest.approx(0, abs=1e-6)
-    assert np.mean(np.abs(data["expected_U"].values) - np.abs(plsmodel.y_scores.values)) == pytest.approx(0, abs=1e-5)
+    assert np.mean(np.abs(data["expected_T"]) - np.abs(plsmodel.x_scores.values)) == pytest.approx(0, abs=atol["T"])
+    assert np.mean(np.abs(data["expected_P"]) - np.abs(plsmodel.x_loadings.values)) == pytest.approx(0, abs=atol["P"])
+    assert np.mean(np.abs(data["expected_W"]) - np.abs(plsmodel.x_weights.values)) == pytest.approx(0, abs=atol["W"])
+    assert np.mean(np.abs(data["expected_C"]) - np.abs(plsmodel.y_loadings.values)) == pytest.approx(0, abs=atol["C"])
+    assert np.mean(np.abs(data["expected_U"]) - np.abs(plsmodel.y_scores.values)) == pytest.approx(0, abs=atol["U"])
     assert np.mean(
-        data["expected_Hotellings_T2_A3"].values.ravel() - plsmodel.Hotellings_T2.iloc[:, 2].values.ravel()
+        data["expected_Hotellings_T2_A3"].ravel() - plsmodel.Hotellings_T2.iloc[:, 2].values.ravel()
     ) == pytest.approx(0, abs=1e-6)
     assert np.mean(
-        data["expected_Hotellings_T2_A6"].values.ravel() - plsmodel.Hotellings_T2.iloc[:, 5].values.ravel()
+        data["expected_Hotellings_T2_A6"].ravel() - plsmodel.Hotellings_T2.iloc[:, 5].values.ravel()
     ) == pytest.approx(0, abs=1e-6)
     assert np.mean(data["expected_SD_t"].ravel() - plsmodel.scaling_factor_for_scores.values.ravel()) == pytest.approx(
-        0, abs=1e-5
+        0, abs=atol["SD_t"]
     )
 
     # Absolute sum of the deviations, accounting for the fact that each column in Y has quite
     # different range/scaling.
+    Y_mcuv = data["Y_mcuv"]
     assert np.sum(
         np.abs(
-            np.sum(np.abs(Y_mcuv.inverse_transform(plsmodel.predictions) - data["expected_Yhat_A6"].values))
-            / Y_mcuv.center_
+            np.sum(np.abs(Y_mcuv.inverse_transform(plsmodel.predictions) - data["expected_Yhat_A6"])) / Y_mcuv.center_
         )
-    ) == pytest.approx(0, abs=1e-2)
+    ) == pytest.approx(0, abs=atol["Yhat"])
+
+
+def test_pls_simca_ldpe(fixture_PLS_LDPE_example):
+    """Unit test for LDPE case study.
+
+    Parameters
+    ----------
+    PLS_model_SIMCA_LDPE_example : dict
+        Dictionary of raw data and expected outputs from the PLS model.
+    """
+    data = fixture_PLS_LDPE_example
+    plsmodel = PLS(n_components=data["A"])
+    plsmodel.fit(data["X_scaled"], data["Y_scaled"])
+
+    _check_pls_outputs(plsmodel, data, atol=dict(T=1e-4, P=1e-5, W=1e-6, C=1e-6, U=1e-5, SD_t=1e-5, Yhat=1e-2))
 
 
 def test_pls_simca_ldpe_missing_data(fixture_PLS_LDPE_example):
@@ -1184,36 +1320,11 @@ def test_pls_simca_ldpe_missing_data(fixture_PLS_LDPE_example):
 
     """
     data = fixture_PLS_LDPE_example
-    data["X"].iloc[11, 0] = np.nan
+    X = data["X"].copy()  # the fixture is shared: do not modify it in place
+    X[11, 0] = np.nan
     plsmodel = PLS(n_components=data["A"], missing_data_settings=dict(md_method="scp"))
 
-    X_mcuv = MCUVScaler().fit(data["X"])
-    Y_mcuv = MCUVScaler().fit(data["Y"])
-    plsmodel = plsmodel.fit(X_mcuv.transform(data["X"]), Y_mcuv.transform(data["Y"]))
-    # Can only get these to very loosely match
-    assert data["expected_T2_lim_95_A6"] == pytest.approx(plsmodel.T2_limit(0.95), rel=1e-1)
-    assert data["expected_T2_lim_99_A6"] == pytest.approx(plsmodel.T2_limit(0.99), rel=1e-1)
-
-    assert np.mean(np.abs(data["expected_T"].values) - np.abs(plsmodel.x_scores.values)) == pytest.approx(0, abs=1e-2)
-    assert np.mean(np.abs(data["expected_P"].values) - np.abs(plsmodel.x_loadings.values)) == pytest.approx(0, abs=1e-3)
-    assert np.mean(np.abs(data["expected_W"].values) - np.abs(plsmodel.x_weights.values)) == pytest.approx(0, abs=1e-3)
-    assert np.mean(np.abs(data["expected_C"].values) - np.abs(plsmodel.y_loadings.values)) == pytest.approx(0, abs=1e-3)
-    assert np.mean(np.abs(data["expected_U"].values) - np.abs(plsmodel.y_scores.values)) == pytest.approx(0, abs=5e-1)
-    assert np.mean(
-        data["expected_Hotellings_T2_A3"].values.ravel() - plsmodel.Hotellings_T2.iloc[:, 2].values.ravel()
-    ) == pytest.approx(0, abs=1e-6)
-    assert np.mean(
-        data["expected_Hotellings_T2_A6"].values.ravel() - plsmodel.Hotellings_T2.iloc[:, 5].values.ravel()
-    ) == pytest.approx(0, abs=1e-6)
-    assert np.mean(data["expected_SD_t"].ravel() - plsmodel.scaling_factor_for_scores.values.ravel()) == pytest.approx(
-        0, abs=1e-2
-    )
+    X_mcuv = MCUVScaler().fit(X)
+    plsmodel = plsmodel.fit(X_mcuv.transform(X), data["Y_scaled"].copy())
 
-    # Absolute sum of the deviations, accounting for the fact that each column in Y has quite
-    # different range/scaling.
-    assert np.sum(
-        np.abs(
-            np.sum(np.abs(Y_mcuv.inverse_transform(plsmodel.predictions) - data["expected_Yhat_A6"].values))
-            / Y_mcuv.center_
-        )
-    ) == pytest.approx(0, abs=0.5)
+    _check_pls_outputs(plsmodel, data, atol=dict(T=1e-2, P=1e-3, W=1e-3, C=1e-3, U=5e-1, SD_t=1e-2, Yhat=0.5))